@@ -0,0 +1,139 @@
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote
+import requests
+from requests.adapters import HTTPAdapter
+
+# bible-api.com 客户端：复用连接（keep-alive）、设置超时，并对暂时性错误（429/5xx）重试
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class BibleApiClient:
+    """
+    带连接池、超时、重试和耗时统计的 bible-api.com 客户端
+
+    Example:
+        client = BibleApiClient(connect_timeout=3, read_timeout=20)
+        verses = client.fetch_verses("路加福音", 9, 1, 6, "cuv")
+        print(client.metrics())
+    """
+
+    def __init__(self, base_url="https://bible-api.com", connect_timeout=5, read_timeout=30,
+                 max_retries=4, backoff=0.5, max_backoff=30, pool_size=10):
+        """
+        Args:
+            base_url: API地址
+            connect_timeout: 建立连接超时（秒）
+            read_timeout: 读取响应超时（秒）
+            max_retries: 暂时性错误最多重试次数
+            backoff: 指数退避的初始等待时间（秒）
+            max_backoff: 单次等待的上限（秒），同样限制 Retry-After
+            pool_size: 连接池大小（并发请求数）
+        """
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._latencies = deque(maxlen=1000)
+        self._retries = 0
+        self._lock = threading.Lock()
+
+    def _retry_delay(self, attempt, response=None):
+        """Retry-After 优先，否则使用带随机抖动的指数退避"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def get(self, url):
+        """
+        发送GET请求，对连接错误、超时和 429/5xx 响应按退避策略重试
+
+        Args:
+            url: 完整URL或以 / 开头的路径
+
+        Returns:
+            requests.Response: 最后一次请求的响应（可能仍是错误状态，由调用者决定如何处理）
+        """
+        if url.startswith("/"):
+            url = self.base_url + url
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(url, None, time.perf_counter() - start)
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+            else:
+                self._record(url, response.status_code, time.perf_counter() - start)
+                if response.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                    return response
+
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+            with self._lock:
+                self._retries += 1
+
+    def fetch_verses(self, book_name, chapter, start_verse, end_verse, translation):
+        """
+        获取一段经文
+
+        Returns:
+            list: bible-api 返回的经文记录列表（含 book_id、chapter、verse、text）
+        """
+        path = f"/{quote(book_name)}+{chapter}:{start_verse}-{end_verse}?translation={translation}"
+        response = self.get(path)
+        response.raise_for_status()
+        return response.json()["verses"]
+
+    def _record(self, url, status, seconds):
+        with self._lock:
+            self._latencies.append((url, status, seconds))
+
+    def metrics(self):
+        """
+        最近请求的耗时统计
+
+        Returns:
+            dict: {'requests', 'retries', 'errors', 'mean', 'p50', 'p95', 'max', 'last'}，时间单位为秒
+        """
+        with self._lock:
+            records = list(self._latencies)
+            retries = self._retries
+        if not records:
+            return {'requests': 0, 'retries': retries, 'errors': 0}
+        seconds = sorted(record[2] for record in records)
+        return {
+            'requests': len(records),
+            'retries': retries,
+            'errors': sum(1 for record in records if record[1] is None or record[1] >= 400),
+            'mean': sum(seconds) / len(seconds),
+            'p50': seconds[len(seconds) // 2],
+            'p95': seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))],
+            'max': seconds[-1],
+            'last': records[-1],
+        }
+
+
+# 模块级共享客户端，get_bibles 和 bible_store 都通过它访问 bible-api
+client = BibleApiClient()
@@ -0,0 +1,188 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+from urllib.parse import quote
+from bible_client import client
+
+# 本地经文库：整本译本导入到 SQLite，按 (译本, 卷, 章, 节) 主键查询，无需联网
+# 导入：
+#   python bible_store.py import-api cuv 路加福音 马太福音      # 从 bible-api.com 逐章下载
+#   python bible_store.py import-json lsf lsf.json             # 从本地JSON文件导入
+
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bibles.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verses (
+    translation TEXT NOT NULL,
+    book TEXT NOT NULL,
+    chapter INTEGER NOT NULL,
+    verse INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (translation, book, chapter, verse)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS book_aliases (
+    alias TEXT PRIMARY KEY,
+    book TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_local = threading.local()
+
+
+def _connect(store_file=DEFAULT_STORE):
+    """每个线程一个只读连接；经文库不存在时返回None"""
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    if store_file not in connections:
+        if not os.path.exists(store_file):
+            return None
+        uri = f"file:{quote(os.path.abspath(store_file))}?mode=ro"
+        connections[store_file] = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    return connections[store_file]
+
+
+def _resolve_book(conn, book_name):
+    """把卷名（"路加福音"、"Luke"、"LUK"）解析为库中的卷标识"""
+    row = conn.execute("SELECT book FROM book_aliases WHERE alias = ?", (book_name.lower(),)).fetchone()
+    return row[0] if row else book_name
+
+
+def get_verses(translation, book_name, chapter, start_verse, end_verse, store_file=DEFAULT_STORE):
+    """
+    从本地经文库读取经文
+
+    Args:
+        translation: 译本，如 "cuv"、"lsf"
+        book_name: 圣经卷名（中文、英文或卷标识）
+        chapter: 第几章
+        start_verse: 起始节
+        end_verse: 结束节
+        store_file: 经文库文件路径
+
+    Returns:
+        list: [(节号, 经文原文), ...]，只包含库中有的节（译本省略的节、导入时API未返回的节不在其中，
+              由 Passage.missing() 报告）；库中没有该章或该章没有导入到 end_verse 时返回None
+    """
+    conn = _connect(store_file)
+    if conn is None:
+        return None
+    book = _resolve_book(conn, book_name)
+    # 该章已导入（且导入到了结束节）就以库为准，不要求范围内每一节都存在
+    last_verse, = conn.execute(
+        "SELECT MAX(verse) FROM verses WHERE translation = ? AND book = ? AND chapter = ?",
+        (translation, book, chapter),
+    ).fetchone()
+    if last_verse is None or last_verse < end_verse:
+        return None
+    return conn.execute(
+        "SELECT verse, text FROM verses WHERE translation = ? AND book = ? AND chapter = ? "
+        "AND verse BETWEEN ? AND ? ORDER BY verse",
+        (translation, book, chapter, start_verse, end_verse),
+    ).fetchall()
+
+
+def open_store_for_writing(store_file=DEFAULT_STORE):
+    """打开（必要时创建）经文库用于导入"""
+    conn = sqlite3.connect(store_file)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def add_alias(conn, alias, book):
+    """登记卷名别名，如 add_alias(conn, "路加福音", "LUK")"""
+    conn.execute("INSERT OR REPLACE INTO book_aliases (alias, book) VALUES (?, ?)", (alias.lower(), book))
+
+
+def import_verses(conn, translation, verses, alias=None):
+    """
+    导入经文记录
+
+    Args:
+        conn: open_store_for_writing 返回的连接
+        translation: 译本
+        verses: 记录列表，每条含 book（或 book_id）、chapter、verse、text，可选 book_name
+        alias: 额外登记的卷名别名（如用户使用的中文卷名）
+
+    Returns:
+        int: 导入的节数
+    """
+    rows = []
+    for verse in verses:
+        book = verse.get('book_id') or verse['book']
+        rows.append((translation, book, int(verse['chapter']), int(verse['verse']), verse['text']))
+        add_alias(conn, book, book)
+        if verse.get('book_name'):
+            add_alias(conn, verse['book_name'], book)
+        if alias:
+            add_alias(conn, alias, book)
+    conn.executemany(
+        "INSERT OR REPLACE INTO verses (translation, book, chapter, verse, text) VALUES (?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    return len(rows)
+
+
+def import_json(translation, json_file, store_file=DEFAULT_STORE):
+    """
+    从JSON文件导入整本译本
+
+    JSON 可以是记录列表 [{"book": "LUK", "chapter": 9, "verse": 1, "text": "..."}, ...]，
+    也可以是 bible-api 的返回格式 {"verses": [...]}。
+
+    Returns:
+        int: 导入的节数
+    """
+    with open(json_file, encoding='utf-8') as f:
+        data = json.load(f)
+    verses = data['verses'] if isinstance(data, dict) else data
+    conn = open_store_for_writing(store_file)
+    try:
+        return import_verses(conn, translation, verses)
+    finally:
+        conn.close()
+
+
+def import_from_api(translation, book_names, store_file=DEFAULT_STORE):
+    """
+    从 bible-api.com 逐章下载整卷经文并导入，直到该卷没有更多章节
+
+    Args:
+        translation: 译本，如 "cuv"
+        book_names: 卷名列表，如 ["路加福音", "马太福音"]
+
+    Returns:
+        int: 导入的节数
+    """
+    conn = open_store_for_writing(store_file)
+    total = 0
+    try:
+        for book_name in book_names:
+            chapter = 1
+            while True:
+                response = client.get(f"/{quote(book_name)}+{chapter}?translation={translation}")
+                if response.status_code == 404:
+                    break
+                response.raise_for_status()
+                verses = response.json()['verses']
+                if not verses or verses[0]['chapter'] != chapter:
+                    break
+                total += import_verses(conn, translation, verses, alias=book_name)
+                print(f"已导入 {translation} {book_name} 第 {chapter} 章（{len(verses)} 节）")
+                chapter += 1
+    finally:
+        conn.close()
+    return total
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == 'import-api':
+        count = import_from_api(sys.argv[2], sys.argv[3:])
+    elif len(sys.argv) == 4 and sys.argv[1] == 'import-json':
+        count = import_json(sys.argv[2], sys.argv[3])
+    else:
+        print("用法: python bible_store.py import-api <译本> <卷名>...")
+        print("      python bible_store.py import-json <译本> <JSON文件>")
+        sys.exit(2)
+    print(f"共导入 {count} 节")
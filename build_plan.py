@@ -0,0 +1,400 @@
+import json
+import os
+import sys
+import get_bibles
+import pptx_reader
+from deck_session import DeckSession
+from pptx_writer import PROFILES
+from generate_ppt import check_passages, scripture_replacements
+
+# 计划文件示例（JSON；TOML 结构相同，用 [[steps]] 表示步骤列表）：
+# {
+#     "input": "template.pptx",
+#     "output": "template.pptx",
+#     "profile": "final",
+#     "compact": true,
+#     "steps": [
+#         {"op": "replace_text", "slide": 1, "replacements": {"18/01/2026": "25/01/2026"}},
+#         {"op": "set_texts", "slide": 9, "replacements": {"3": {"0": {"0": "耶稣是谁？我们是谁？"}}}, "font_size": 33},
+#         {"op": "delete", "slides": [14]},
+#         {"op": "duplicate", "slide": 12},
+#         {"op": "swap", "slides": [12, 13]},
+#         {"op": "move", "moves": {"14": 12}},
+#         {"op": "reorder", "order": [1, 2, 3, 5, 4, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15]},
+#         {"op": "insert_video", "path": "../Template/musics/4.mp4", "position": 16, "link": false},
+#         {"op": "insert_videos", "videos": [{"path": "../Template/musics/5.mp4", "position": 17},
+#                                            {"path": "../Template/musics/6.mp4"}]},
+#         {"op": "scripture", "slide": 13, "font_size": 33, "french": false, "strict": false, "passages": [
+#             {"book": "路加福音", "chapter": 9, "start": 12, "end": 17}
+#         ]}
+#     ]
+# }
+# 相对路径均相对于计划文件所在目录。profile 为保存时的压缩方案（draft / default / final），可省略。
+# compact 为 true 时保存前先去掉已删除的页、视频等留下的无用部件，可省略。
+# 页码均为执行到该步时的页码（前面的删除、复制、插入会改变页数），执行前按原PPT的页数逐步检查。
+# font_size 为填写文字的字号（pt，默认33）；french 为 true 时经文使用法语译本（lsf），均可省略。
+# 经文获取失败时该步失败、不保存；strict 为 true 时范围内缺少任何一节也算失败。
+
+
+def _is_page(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 1
+
+
+def _is_size(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def _page_errors(name, value, count):
+    """检查一个页码；count 为执行到这一步时PPT的页数（未知时为None）"""
+    if not _is_page(value):
+        return [f"{name} 必须是从1开始的页码"]
+    if count is not None and value > count:
+        return [f"{name} {value} 超出范围（此时共 {count} 页）"]
+    return []
+
+
+def _check_replace_text(step, count):
+    errors = []
+    replacements = step.get('replacements')
+    if not isinstance(replacements, dict) or not all(isinstance(text, str) for text in replacements.values()):
+        errors.append("replacements 必须是 {'旧文字': '新文字'} 字典")
+    if 'slide' in step:
+        errors.extend(_page_errors('slide', step['slide'], count))
+    return errors
+
+
+def _check_set_texts(step, count):
+    errors = _page_errors('slide', step.get('slide'), count)
+    replacements = step.get('replacements')
+    if not isinstance(replacements, dict):
+        errors.append("replacements 必须是 {形状索引: {段落索引: {run索引: '新文字'}}} 字典")
+    else:
+        try:
+            replacements = _int_keys(replacements)
+        except (ValueError, TypeError, AttributeError):
+            errors.append("replacements 的索引必须是整数")
+        else:
+            if not all(isinstance(text, str) for paragraphs in replacements.values()
+                       for runs in paragraphs.values() for text in runs.values()):
+                errors.append("replacements 中的新文字必须是字符串")
+    if 'font_size' in step and not _is_size(step['font_size']):
+        errors.append("font_size 必须是正数（pt）")
+    return errors
+
+
+def _check_duplicate(step, count):
+    return _page_errors('slide', step.get('slide'), count)
+
+
+def _check_delete(step, count):
+    slides = step.get('slides')
+    if not isinstance(slides, list) or not slides or not all(_is_page(n) for n in slides):
+        return ["slides 必须是非空的页码列表"]
+    if len(set(slides)) != len(slides):
+        return ["slides 中的页码不能重复"]
+    return [error for n in slides for error in _page_errors('slides 中的页码', n, count)]
+
+
+def _check_swap(step, count):
+    slides = step.get('slides')
+    if not isinstance(slides, list) or len(slides) != 2 or not all(_is_page(n) for n in slides):
+        return ["slides 必须是两个页码，如 [12, 13]"]
+    if slides[0] == slides[1]:
+        return ["两个页码不能相同"]
+    return [error for n in slides for error in _page_errors('slides 中的页码', n, count)]
+
+
+def _check_move(step, count):
+    moves = step.get('moves')
+    if not isinstance(moves, dict) or not moves:
+        return ["moves 必须是非空的 {原页码: 新页码} 字典，如 {\"14\": 12}"]
+    try:
+        sources = [int(slide_number) for slide_number in moves]
+    except ValueError:
+        return ["moves 的原页码必须是整数"]
+    errors = []
+    for slide_number, position in zip(sources, moves.values()):
+        errors.extend(_page_errors('moves 的原页码', slide_number, count))
+        errors.extend(_page_errors('moves 的新页码', position, count))
+    if not errors and len(set(moves.values())) != len(moves):
+        errors.append("moves 中的新页码不能重复")
+    return errors
+
+
+def _check_reorder(step, count):
+    order = step.get('order')
+    if not isinstance(order, list) or not order or not all(_is_page(n) for n in order):
+        return ["order 必须是按新顺序排列的页码列表"]
+    if count is not None and len(order) != count:
+        return [f"order 必须包含全部 {count} 页（现有 {len(order)} 个页码）"]
+    if sorted(order) != list(range(1, len(order) + 1)):
+        return ["order 必须包含第 1 页至最后一页且各一次"]
+    return []
+
+
+def _check_insert_video(step, count):
+    errors = []
+    if not isinstance(step.get('path'), str):
+        errors.append("path 必须是视频文件路径")
+    elif not os.path.exists(step['path']):
+        errors.append(f"找不到视频文件 {step['path']}")
+    if step.get('position') is not None:
+        errors.extend(_page_errors('position', step['position'], None if count is None else count + 1))
+    if not isinstance(step.get('link', False), bool):
+        errors.append("link 必须是 true 或 false")
+    return errors
+
+
+def _check_insert_videos(step, count):
+    videos = step.get('videos')
+    if not isinstance(videos, list) or not videos:
+        return ["videos 必须是非空列表，每项为 {\"path\": 视频文件路径, \"position\": 页码}"]
+    errors = []
+    # position 是插入后的最终页码
+    total = None if count is None else count + len(videos) - 1
+    for n, video in enumerate(videos, 1):
+        if not isinstance(video, dict):
+            errors.append(f"videos 第 {n} 项必须是 {{\"path\": ..., \"position\": ...}}")
+            continue
+        errors.extend(f"videos 第 {n} 项：{message}" for message in _check_insert_video(video, total))
+    positions = [video.get('position') for video in videos if isinstance(video, dict) and video.get('position') is not None]
+    if len(positions) != len(set(positions)):
+        errors.append("videos 中的 position 不能重复")
+    if not isinstance(step.get('link', False), bool):
+        errors.append("link 必须是 true 或 false")
+    return errors
+
+
+def _check_scripture(step, count):
+    errors = _page_errors('slide', step.get('slide'), count)
+    if 'font_size' in step and not _is_size(step['font_size']):
+        errors.append("font_size 必须是正数（pt）")
+    if not isinstance(step.get('french', False), bool):
+        errors.append("french 必须是 true 或 false")
+    if not isinstance(step.get('strict', False), bool):
+        errors.append("strict 必须是 true 或 false")
+    passages = step.get('passages')
+    if not isinstance(passages, list) or not passages:
+        return errors + ["passages 必须是非空列表"]
+    for n, passage in enumerate(passages, 1):
+        if not isinstance(passage, dict) or not isinstance(passage.get('book'), str):
+            errors.append(f"第 {n} 段经文缺少 book")
+            continue
+        if not all(_is_page(passage.get(key)) for key in ('chapter', 'start', 'end')):
+            errors.append(f"第 {n} 段经文的 chapter/start/end 必须是正整数")
+        elif passage['end'] < passage['start']:
+            errors.append(f"第 {n} 段经文的结束节小于起始节")
+    return errors
+
+
+# 操作名 -> 校验函数，参数为 (步骤, 执行到这一步时PPT的页数)
+STEP_CHECKS = {
+    'replace_text': _check_replace_text,
+    'set_texts': _check_set_texts,
+    'duplicate': _check_duplicate,
+    'delete': _check_delete,
+    'swap': _check_swap,
+    'move': _check_move,
+    'reorder': _check_reorder,
+    'insert_video': _check_insert_video,
+    'insert_videos': _check_insert_videos,
+    'scripture': _check_scripture,
+}
+
+
+def _pages_added(step):
+    """一步（已通过检查）执行后PPT增加的页数，删除时为负数"""
+    op = step['op']
+    if op in ('duplicate', 'insert_video'):
+        return 1
+    if op == 'delete':
+        return -len(step['slides'])
+    if op == 'insert_videos':
+        return len(step['videos'])
+    if op == 'scripture':
+        # 每段经文一页，模板页本身填写第一段
+        return len(step['passages']) - 1
+    return 0
+
+
+def _int_keys(replacements):
+    """把JSON/TOML中的字符串索引转换为整数：{'3': {'0': {'1': '文字'}}} -> {3: {0: {1: '文字'}}}"""
+    return {
+        int(shape_index): {
+            int(paragraph_index): {int(run_index): text for run_index, text in runs.items()}
+            for paragraph_index, runs in paragraphs.items()
+        }
+        for shape_index, paragraphs in replacements.items()
+    }
+
+
+def load_plan(plan_file):
+    """
+    读取计划文件（.json 或 .toml），并把相对路径解析为相对于计划文件所在目录
+
+    Args:
+        plan_file: 计划文件路径
+
+    Returns:
+        dict: 计划内容
+    """
+    if plan_file.endswith('.toml'):
+        import tomllib
+        with open(plan_file, 'rb') as f:
+            plan = tomllib.load(f)
+    else:
+        with open(plan_file, encoding='utf-8') as f:
+            plan = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(plan_file))
+    for key in ('input', 'output'):
+        if isinstance(plan.get(key), str):
+            plan[key] = os.path.join(base_dir, plan[key])
+    for step in plan.get('steps', []):
+        if not isinstance(step, dict):
+            continue
+        for item in [step] + [video for video in step.get('videos') or [] if isinstance(video, dict)]:
+            if isinstance(item.get('path'), str):
+                item['path'] = os.path.join(base_dir, item['path'])
+    return plan
+
+
+def validate_plan(plan):
+    """
+    在执行前检查整个计划
+
+    Args:
+        plan: load_plan 返回的计划字典
+
+    Returns:
+        list: 错误信息列表，为空表示计划有效
+    """
+    errors = []
+    count = None
+    if not isinstance(plan.get('input'), str):
+        errors.append("缺少 input（原PPTX文件路径）")
+    elif not os.path.exists(plan['input']):
+        errors.append(f"找不到文件 {plan['input']}")
+    else:
+        try:
+            count = pptx_reader.slide_count(plan['input'])
+        except Exception as e:
+            errors.append(f"无法读取 {plan['input']}：{e}")
+    if 'output' in plan and not isinstance(plan['output'], str):
+        errors.append("output 必须是文件路径")
+    if plan.get('profile', 'default') not in PROFILES:
+        errors.append(f"未知的压缩方案 {plan['profile']!r}，可用: {', '.join(PROFILES)}")
+    if not isinstance(plan.get('compact', False), bool):
+        errors.append("compact 必须是 true 或 false")
+
+    steps = plan.get('steps')
+    if not isinstance(steps, list) or not steps:
+        errors.append("steps 必须是非空列表")
+        return errors
+
+    # 按每一步执行后的页数检查后面各步的页码；某一步有错误后页数未知，之后只检查格式
+    for n, step in enumerate(steps, 1):
+        op = step.get('op') if isinstance(step, dict) else None
+        if op not in STEP_CHECKS:
+            errors.append(f"第 {n} 步：未知操作 {op!r}，可用操作: {', '.join(STEP_CHECKS)}")
+            count = None
+            continue
+        step_errors = STEP_CHECKS[op](step, count)
+        errors.extend(f"第 {n} 步（{op}）：{message}" for message in step_errors)
+        count = None if step_errors or count is None else count + _pages_added(step)
+    return errors
+
+
+def _apply_scripture(deck, step):
+    """填写经文页：每段经文一页，全部由模板页一次生成"""
+    page = step['slide']
+    passages = step['passages']
+    font_size = step.get('font_size', 33)
+    translation = 'lsf' if step.get('french', False) else 'cuv'
+    # 所有经文并发获取
+    all_passages = get_bibles.get_passages(
+        [(p['book'], p['chapter'], p['start'], p['end'], translation) for p in passages])
+    # 获取失败（或 strict 时缺少经文）则本步失败，不保存空白经文页
+    if not check_passages(all_passages, step.get('strict', False)):
+        return False
+    return deck.clone_slide(page, [scripture_replacements(passage) for passage in all_passages], font_size)
+
+
+def apply_step(deck, step):
+    """
+    在打开的 DeckSession 上执行一步操作
+
+    Args:
+        deck: DeckSession 对象
+        step: 已通过 validate_plan 检查的步骤字典
+
+    Returns:
+        bool: 是否成功
+    """
+    op = step['op']
+    if op == 'replace_text':
+        if 'slide' in step:
+            return deck.update_slide_text(step['slide'], step['replacements'])
+        return deck.update_pptx_text(step['replacements'])
+    if op == 'set_texts':
+        return deck.set_pptx_page_texts_by_slides_shapes_index(
+            step['slide'], _int_keys(step['replacements']), step.get('font_size', 33))
+    if op == 'duplicate':
+        return deck.duplicate_slide(step['slide'])
+    if op == 'delete':
+        return deck.delete_slides(step['slides'])
+    if op == 'swap':
+        return deck.swap_slides(*step['slides'])
+    if op == 'move':
+        return deck.move_slides({int(slide_number): position for slide_number, position in step['moves'].items()})
+    if op == 'reorder':
+        return deck.reorder_slides(step['order'])
+    if op == 'insert_video':
+        return deck.insert_fullscreen_video_slide(step['path'], step.get('position'), step.get('link', False))
+    if op == 'insert_videos':
+        videos = [(video.get('position'), video['path']) for video in step['videos']]
+        return deck.insert_video_slides(videos, step.get('link', False))
+    if op == 'scripture':
+        return _apply_scripture(deck, step)
+    raise ValueError(f"未知操作 {op!r}")
+
+
+def run_plan(plan):
+    """
+    校验并执行计划：只打开一次PPT，依次执行所有步骤，最后保存一次
+
+    任何一步失败时不保存，原文件保持不变。
+
+    Args:
+        plan: load_plan 返回的计划字典
+
+    Returns:
+        bool: 是否成功
+    """
+    errors = validate_plan(plan)
+    if errors:
+        print("计划无效：")
+        for message in errors:
+            print(f"  - {message}")
+        return False
+
+    deck = DeckSession(plan['input'], plan.get('output'), plan.get('profile', 'default'), plan.get('compact', False))
+    for n, step in enumerate(plan['steps'], 1):
+        print(f"第 {n} 步：{step['op']}")
+        try:
+            ok = apply_step(deck, step)
+        except Exception as e:
+            print(f"错误：{type(e).__name__}: {e}")
+            ok = False
+        if not ok:
+            print(f"错误：第 {n} 步执行失败，未保存任何修改")
+            return False
+    deck.save()
+    return True
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("用法: python build_plan.py <计划文件.json|.toml>")
+        sys.exit(2)
+    sys.exit(0 if run_plan(load_plan(sys.argv[1])) else 1)
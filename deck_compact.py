@@ -0,0 +1,104 @@
+from deck_media import _P14, _part_size
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx_reader import _R
+
+# 整理PPT：删除幻灯片、替换视频之后，去掉已经不再使用的关系，使不再被引用的部件
+# （幻灯片、备注页、视频、图片）从关系图中脱离，保存时不再写入输出文件。
+# python-pptx（和 pptx_writer）保存时只写入从包根部沿关系能到达的部件，
+# 所以只要关系图中没有多余的边，无用的部件就不会被保存。
+
+# 在XML中用 r:id、r:embed、r:link 等属性显式引用的关系类型，XML中已不再引用时可以删除。
+# 版式、母版、主题、备注页等关系是隐式的（XML中没有引用），不检查。
+_EXPLICIT = {RT.IMAGE, RT.MEDIA, RT.VIDEO, RT.AUDIO, RT.HYPERLINK}
+
+
+def _referenced_rids(element):
+    """XML中所有 r:* 属性引用的 rId"""
+    return {value for node in element.iter(etree.Element) for name, value in node.attrib.items()
+            if name.startswith(_R)}
+
+
+def _remove_references(element, rId):
+    """删除XML中引用 rId 的元素（如跳转到已删除页的超链接、自定义放映中的该页）"""
+    for node in [node for node in element.iter(etree.Element) if rId in node.attrib.values()]:
+        if any(value == rId and name.startswith(_R) for name, value in node.attrib.items()):
+            node.getparent().remove(node)
+
+
+def _prune_sections(prs):
+    """从节（section）列表中去掉已删除的页，否则 PowerPoint 打开时会提示修复"""
+    slide_ids = {str(sldId.id) for sldId in prs.slides._sldIdLst}
+    for node in list(prs.part._element.iter(f'{{{_P14}}}sldId')):
+        if node.get('id') not in slide_ids:
+            node.getparent().remove(node)
+
+
+def drop_slide_links(prs):
+    """
+    删除指向已不在幻灯片列表中的页的关系，以及引用它们的元素（其他页跳转到该页的超链接、自定义放映中的该页）
+
+    删除幻灯片后立即调用：被删除的页不再从任何地方可达，重新编号幻灯片部件时不会与它重名。
+
+    Args:
+        prs: python-pptx 的 Presentation 对象
+
+    Returns:
+        int: 删除的关系数
+    """
+    slides = {prs.part.related_part(sldId.rId) for sldId in prs.slides._sldIdLst}
+    dropped = 0
+    for part in list(prs.part.package.iter_parts()):
+        element = getattr(part, '_element', None)
+        if element is None:
+            continue
+        for rId, rel in list(part.rels.items()):
+            if rel.reltype == RT.SLIDE and not rel.is_external and rel.target_part not in slides:
+                _remove_references(element, rId)
+                part.rels.pop(rId)
+                dropped += 1
+    return dropped
+
+
+def compact(prs, loaded_parts=()):
+    """
+    删除PPT关系图中已经无用的关系，使不再使用的部件不会被保存
+
+    - 指向已不在幻灯片列表中的页的关系（包括其他页跳转到该页的超链接）
+    - XML中已不再引用的图片、视频、音频、超链接关系（如删除了视频形状后留下的关系）
+
+    被删除的页连同它的备注页、只被它使用的视频和图片都不再可达。
+    版式和母版即使没有页使用也保留（新建幻灯片时还要用到）。
+
+    Args:
+        prs: python-pptx 的 Presentation 对象
+        loaded_parts: 打开PPT时的所有部件（DeckSession 打开时记录）。删除幻灯片时页和它的视频
+                      已经不可达，只比较本次调用前后会漏掉它们，所以与打开时的部件比较
+
+    Returns:
+        dict: {'parts': 与打开时相比不再保存的部件数（包括本次会话中新加后又不再使用的部件）,
+               'bytes': 这些部件的大小（未压缩）, 'rels': 删除的关系数}
+    """
+    package = prs.part.package
+    before = list(package.iter_parts())
+
+    _prune_sections(prs)
+    dropped = drop_slide_links(prs)
+    for part in list(package.iter_parts()):
+        element = getattr(part, '_element', None)
+        if element is None:
+            continue
+        referenced = None
+        for rId, rel in list(part.rels.items()):
+            if rel.reltype not in _EXPLICIT:
+                continue
+            if referenced is None:
+                referenced = _referenced_rids(element)
+            if rId not in referenced:
+                part.rels.pop(rId)
+                dropped += 1
+
+    after = set(package.iter_parts())
+    # 按部件对象（而不是部件名）比较：删除页后其余页会重新编号
+    removed = [part for part in dict.fromkeys([*loaded_parts, *before]) if part not in after]
+    return {'parts': len(removed), 'bytes': sum(_part_size(part) for part in removed), 'rels': dropped}
@@ -0,0 +1,205 @@
+import hashlib
+import os
+import pathlib
+from pptx.media import Video
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.parts.media import MediaPart
+from pptx.shapes.shapetree import _MoviePicElementCreator
+from pptx.oxml.ns import qn
+from pptx.util import lazyproperty
+
+# 按内容去重的媒体（视频）插入：同一个视频文件无论插入多少次、在哪一周的运行中插入，
+# PPT中只保存一份，新的幻灯片只增加指向已有媒体部件的关系。
+# 新插入的视频不读入内存，只记录文件路径，保存时由 pptx_writer 分块写入输出文件。
+# 也可以不嵌入视频，只按相对路径链接外部文件（link_target / add_movie(link=...)）。
+
+_HASH_CHUNK = 1024 * 1024
+_P14 = 'http://schemas.microsoft.com/office/powerpoint/2010/main'
+
+
+def file_sha1(path):
+    """分块计算文件的SHA1，不把整个文件读入内存"""
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class StreamedMediaPart(MediaPart):
+    """
+    只记录源文件路径的媒体部件
+
+    视频数据不读入内存，保存时 pptx_writer 分块读取文件、压缩并写入输出zip，
+    无论视频多大，内存占用都不变。文件在插入后到保存前不能被修改。
+    """
+
+    def __init__(self, partname, content_type, package, path):
+        super().__init__(partname, content_type, package)
+        self.path = os.path.abspath(path)
+        stat = os.stat(self.path)
+        self.size = stat.st_size
+        self._mtime = stat.st_mtime_ns
+
+    @classmethod
+    def new(cls, package, path, mime_type=None):
+        video = Video(None, mime_type or CT.VIDEO, os.path.basename(path))
+        return cls(package.next_media_partname(video.ext), video.content_type, package, path)
+
+    def open(self):
+        """打开源文件读取；文件在插入后被修改时报错"""
+        stat = os.stat(self.path)
+        if (stat.st_size, stat.st_mtime_ns) != (self.size, self._mtime):
+            raise RuntimeError(f"视频文件 {self.path} 在插入后被修改，请重新插入")
+        return open(self.path, 'rb')
+
+    @property
+    def blob(self):
+        """需要完整数据时（如直接调用 prs.save）才读取整个文件"""
+        with self.open() as f:
+            return f.read()
+
+    @lazyproperty
+    def sha1(self):
+        return file_sha1(self.path)
+
+
+def _part_size(part):
+    return part.size if isinstance(part, StreamedMediaPart) else len(part.blob)
+
+
+class MediaIndex:
+    """
+    一个PPT中所有媒体部件的内容索引
+
+    python-pptx 每次插入视频都要遍历整个包的关系，并读入、哈希整个新文件才能发现重复。
+    这里先按文件大小筛选：大小与已有媒体都不同的文件一定是新的，不需要计算哈希；
+    大小相同时才比较SHA1（已有部件的哈希只算一次，同一文件的哈希也只算一次）。
+    """
+
+    def __init__(self, package):
+        self._package = package
+        self._by_size = None       # 大小 -> [MediaPart]
+        self._file_hashes = {}     # (路径, 大小, 修改时间) -> SHA1
+
+    def _parts_by_size(self):
+        if self._by_size is None:
+            self._by_size = {}
+            for part in self._package.iter_parts():
+                if isinstance(part, MediaPart):
+                    self._by_size.setdefault(_part_size(part), []).append(part)
+        return self._by_size
+
+    def file_sha1(self, path):
+        """文件的SHA1；文件未变化时不重复计算"""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._file_hashes:
+            self._file_hashes[key] = file_sha1(path)
+        return self._file_hashes[key]
+
+    def find(self, path):
+        """
+        Returns:
+            MediaPart: 内容与文件相同的已有媒体部件，没有时返回None
+        """
+        candidates = self._parts_by_size().get(os.path.getsize(path))
+        if not candidates:
+            return None
+        # 本次会话中已从同一个（未修改的）文件创建过部件时，不需要计算哈希
+        stat = os.stat(path)
+        for part in candidates:
+            if (isinstance(part, StreamedMediaPart) and part.path == os.path.abspath(path)
+                    and (part.size, part._mtime) == (stat.st_size, stat.st_mtime_ns)):
+                return part
+        sha1 = self.file_sha1(path)
+        return next((part for part in candidates if part.sha1 == sha1), None)
+
+    def add(self, part):
+        """登记新建的媒体部件"""
+        self._parts_by_size().setdefault(_part_size(part), []).append(part)
+
+
+class _IndexedMoviePicElementCreator(_MoviePicElementCreator):
+    """
+    通过 MediaIndex 查找或创建媒体部件的视频形状生成器
+
+    视频已存在于PPT中时直接复用；新视频创建 StreamedMediaPart，两种情况都不读入整个文件。
+    """
+
+    def __init__(self, media_index, *args):
+        super().__init__(*args)
+        self._media_index = media_index
+
+    @property
+    def _shape_name(self):
+        return os.path.basename(self._movie_file)
+
+    @lazyproperty
+    def _video_part_rIds(self):
+        slide_part = self._slide_part
+        media_part = self._media_index.find(self._movie_file)
+        if media_part is None:
+            media_part = StreamedMediaPart.new(slide_part.package, self._movie_file, self._mime_type)
+            self._media_index.add(media_part)
+        return slide_part.relate_to(media_part, RT.MEDIA), slide_part.relate_to(media_part, RT.VIDEO)
+
+
+class _LinkedMoviePicElementCreator(_MoviePicElementCreator):
+    """链接外部视频文件（不嵌入）的视频形状生成器"""
+
+    def __init__(self, target, *args):
+        super().__init__(*args)
+        self._target = target
+
+    @property
+    def _shape_name(self):
+        return os.path.basename(self._movie_file)
+
+    @lazyproperty
+    def _video_part_rIds(self):
+        slide_part = self._slide_part
+        return (slide_part.relate_to(self._target, RT.MEDIA, is_external=True),
+                slide_part.relate_to(self._target, RT.VIDEO, is_external=True))
+
+
+def link_target(movie_path, deck_file):
+    """
+    视频相对于PPT所在目录的路径（链接时写入PPT），无法使用相对路径时（如不同盘符）为 file:// 地址
+
+    Args:
+        movie_path: 视频文件路径
+        deck_file: PPT保存的路径
+    """
+    movie_path = os.path.abspath(movie_path)
+    try:
+        return os.path.relpath(movie_path, os.path.dirname(os.path.abspath(deck_file))).replace(os.sep, '/')
+    except ValueError:
+        return pathlib.Path(movie_path).as_uri()
+
+
+def add_movie(shapes, media_index, movie_path, left, top, width, height, mime_type=None, poster_frame_image=None,
+              link=None):
+    """
+    与 shapes.add_movie 相同，但相同内容的视频只保存一份，且视频数据在保存时才从文件分块写入
+
+    Args:
+        shapes: 幻灯片的 shapes
+        media_index: 该PPT的 MediaIndex
+        movie_path: 视频文件路径
+        link: 不为None时不嵌入视频，而是链接到这个地址（见 link_target）
+
+    Returns:
+        新建的视频形状
+    """
+    args = (shapes, shapes._next_shape_id, movie_path, left, top, width, height, poster_frame_image, mime_type)
+    if link is None:
+        movie_pic = _IndexedMoviePicElementCreator(media_index, *args)._pic
+    else:
+        movie_pic = _LinkedMoviePicElementCreator(link, *args)._pic
+        # 链接的视频在 Office 2010 扩展中也用 r:link 引用
+        media = movie_pic.find(f'.//{{{_P14}}}media')
+        media.set(qn('r:link'), media.attrib.pop(qn('r:embed')))
+    shapes._spTree.append(movie_pic)
+    shapes._add_video_timing(movie_pic)
+    return shapes._shape_factory(movie_pic)
@@ -0,0 +1,687 @@
+from pptx import Presentation
+import os
+from collections import Counter
+from lxml import etree
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.parts.slide import SlidePart
+from pptx.util import Pt, Inches
+from text_replace import Replacer
+from text_index import TextIndex
+import pptx_writer
+import deck_media
+import deck_compact
+
+
+_R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+
+def _copy_relationships(source_part, slide_part):
+    """
+    给副本建立与原页相同的关系（版式、图片、媒体、超链接等），指向同样的部件，不复制数据
+
+    备注页只属于原页，不共用。
+
+    Returns:
+        dict: {原页的rId: 副本的rId}
+    """
+    rId_map = {}
+    for rId, rel in source_part.rels.items():
+        if rel.reltype == RT.NOTES_SLIDE:
+            continue
+        if rel.is_external:
+            rId_map[rId] = slide_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+        else:
+            rId_map[rId] = slide_part.relate_to(rel.target_part, rel.reltype)
+    return rId_map
+
+
+def _remap_rids(element, rId_map):
+    """把XML中 r:id、r:embed、r:link 等引用改为副本的rId（编号相同时不需要修改）"""
+    changes = {old: new for old, new in rId_map.items() if old != new}
+    if not changes:
+        return
+    for elm in element.iter(etree.Element):
+        for name, value in elm.attrib.items():
+            if name.startswith(_R) and value in changes:
+                elm.set(name, changes[value])
+
+
+class DeckSession:
+    """
+    一次打开PPTX文件，在内存中完成多项修改，最后只保存一次
+
+    generate_ppt.py 中的每个函数都会重新读取并保存整个文件，连续调用十几次时
+    整个zip包会被反复解析和压缩。DeckSession 把这些操作作为方法暴露出来，
+    所有修改都作用在同一个内存中的 Presentation 上。
+
+    Example:
+        with DeckSession(pptx_file, output_file) as deck:
+            deck.duplicate_slide(12)
+            deck.set_pptx_page_texts_by_slides_shapes_index(13, replacements)
+            deck.swap_slides(12, 13)
+        # 退出 with 时自动保存一次（发生异常时不保存）
+    """
+
+    def __init__(self, pptx_file, output_file=None, profile='default', compact=False):
+        """
+        Args:
+            pptx_file: 原PPTX文件路径
+            output_file: 输出PPTX文件路径，为None时覆盖原文件
+            profile: 保存时的压缩方案：'draft'（快速，适合中间保存）、'default'、
+                     'final'（最大压缩，并行），见 pptx_writer.PROFILES
+            compact: 为True时每次保存前先整理PPT（见 compact 方法）
+        """
+        if not os.path.exists(pptx_file):
+            raise FileNotFoundError(f"找不到文件 {pptx_file}")
+        if profile not in pptx_writer.PROFILES:
+            raise ValueError(f"未知的压缩方案 {profile!r}，可用: {', '.join(pptx_writer.PROFILES)}")
+        self.pptx_file = pptx_file
+        self.output_file = output_file or pptx_file
+        self.profile = profile
+        self.compact_on_save = compact
+        self.prs = Presentation(pptx_file)
+        # 打开时的所有部件，compact 据此统计删除幻灯片等操作后释放的大小
+        self._loaded_parts = list(self.prs.part.package.iter_parts())
+        self._text_index = None
+        self._media_index = None
+
+    @property
+    def text_index(self):
+        """
+        文字位置索引，第一次使用时建立；之后的替换只访问包含旧文字的段落
+
+        直接通过 deck.prs 修改文字后，需要调用 deck.text_index.invalidate(slide)。
+        """
+        if self._text_index is None:
+            self._text_index = TextIndex(self.prs)
+        return self._text_index
+
+    @property
+    def media_index(self):
+        """媒体内容索引，插入已存在于PPT中的视频时直接复用原来的媒体部件"""
+        if self._media_index is None:
+            self._media_index = deck_media.MediaIndex(self.prs.part.package)
+        return self._media_index
+
+    def _invalidate(self, slide):
+        """通知文字索引：该页的文字或形状已被修改"""
+        if self._text_index is not None:
+            self._text_index.invalidate(slide)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.save()
+        return False
+
+    def save(self, output_file=None, profile=None, compact=None):
+        """
+        保存PPT
+
+        只重新压缩有变化的部件，未变化的部件（视频、图片等）直接从原文件复制压缩数据
+
+        Args:
+            output_file: 输出PPTX文件路径，为None时使用创建会话时指定的路径
+            profile: 本次保存的压缩方案，为None时使用创建会话时指定的方案
+            compact: 保存前是否先整理PPT，为None时使用创建会话时指定的设置
+
+        Returns:
+            str: 实际保存的文件路径
+        """
+        if self.compact_on_save if compact is None else compact:
+            self.compact()
+        output_file = output_file or self.output_file
+        pptx_writer.save_presentation(self.prs, output_file, self.pptx_file, profile or self.profile)
+        print(f"文件已保存: {output_file}")
+        return output_file
+
+    def compact(self):
+        """
+        整理PPT：去掉已删除的页、已删除的视频形状等留下的关系，
+        使不再使用的幻灯片、备注页、视频和图片不会被保存（见 deck_compact.compact）
+
+        Returns:
+            dict: {'parts': 不再保存的部件数, 'bytes': 释放的字节数（未压缩）, 'rels': 删除的关系数}
+        """
+        stats = deck_compact.compact(self.prs, self._loaded_parts)
+        # 下次整理只统计之后释放的部件
+        self._loaded_parts = list(self.prs.part.package.iter_parts())
+        if stats['parts']:
+            # 媒体索引中可能还有已被移除的视频
+            self._media_index = None
+        print(f"整理完成：移除 {stats['parts']} 个不再使用的部件，"
+              f"释放 {stats['bytes'] / 1024 / 1024:.1f} MB（未压缩），删除 {stats['rels']} 个无用关系")
+        return stats
+
+    def _check_slide_number(self, slide_number):
+        """检查页码是否有效（从1开始）"""
+        if slide_number < 1 or slide_number > len(self.prs.slides):
+            print(f"错误：页码 {slide_number} 超出范围（共 {len(self.prs.slides)} 页）")
+            return False
+        return True
+
+    def _move_last_slide(self, index):
+        """把最后一页（刚添加的幻灯片）移动到索引 index（从0开始）"""
+        xml_slides = self.prs.slides._sldIdLst
+        last = xml_slides[-1]
+        xml_slides.remove(last)
+        xml_slides.insert(index, last)
+
+    def _arrange(self, order):
+        """按 order（sldId 元素列表）一次性重排 sldIdLst"""
+        self.prs.slides._sldIdLst[:] = order
+
+    def _renumber_slide_parts(self):
+        """
+        删除幻灯片后重新编号slide部件
+
+        python-pptx 只在第一次访问 prs.slides 时编号，按 len(sldIdLst)+1 生成新页的部件名，
+        同一会话中先删除再添加会产生重名部件。
+        """
+        self.prs.part.rename_slide_parts([sldId.rId for sldId in self.prs.slides._sldIdLst])
+
+    def _replace_text(self, replacements, slides=None, verbose=False):
+        """
+        在指定页（为None时所有页）的段落中进行替换（replacements 为字典或已编译的 Replacer）
+
+        按段落匹配，被拆分到多个run中的文字也能被替换，新文字沿用匹配开始处run的格式。
+        通过文字索引只访问包含旧文字的段落。
+        """
+        replacer = Replacer.of(replacements)
+        if not replacer:
+            return
+        for _, old_text, new_text in self.text_index.replace(replacer, slides):
+            if verbose:
+                print(f"{old_text} → {new_text}", end="\n")
+
+    def update_pptx_text(self, replacements):
+        """
+        修改所有页中的文字
+
+        Args:
+            replacements: 字典，格式 {'旧文字': '新文字'}，或 text_replace.Replacer
+        """
+        self._replace_text(replacements)
+        return True
+
+    def update_slide_text(self, slide_number, replacements):
+        """
+        修改指定页的文字内容
+
+        Args:
+            slide_number: 页码（从1开始）
+            replacements: 字典，格式 {'旧文字': '新文字'}，或 text_replace.Replacer
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self._check_slide_number(slide_number):
+            return False
+        self._replace_text(replacements, [self.prs.slides[slide_number - 1]])
+        print(f"已修改第 {slide_number} 页")
+        return True
+
+    def update_multiple_slides(self, slide_replacements):
+        """
+        批量修改多页的文字内容
+
+        Args:
+            slide_replacements: 字典，格式 {页码: {'旧文字': '新文字'} 或 Replacer}
+
+        Returns:
+            bool: 是否成功
+        """
+        for slide_number, replacements in slide_replacements.items():
+            if slide_number < 1 or slide_number > len(self.prs.slides):
+                print(f"警告：页码 {slide_number} 超出范围（共 {len(self.prs.slides)} 页），跳过")
+                continue
+            self._replace_text(replacements, [self.prs.slides[slide_number - 1]])
+            print(f"已修改第 {slide_number} 页")
+        return True
+
+    def set_pptx_page_texts(self, slide_number, replacements):
+        """
+        修改指定页的文字内容，并打印每处替换
+
+        Args:
+            slide_number: 页码（从1开始）
+            replacements: 字典，格式 {'旧文字': '新文字'}，或 text_replace.Replacer
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self._check_slide_number(slide_number):
+            return False
+        self._replace_text(replacements, [self.prs.slides[slide_number - 1]], verbose=True)
+        print(f"已修改第 {slide_number} 页")
+        return True
+
+    def set_pptx_page_texts_by_slides_shapes_index(self, slide_number, replacements, font_size=33):
+        """
+        按 形状/段落/run 索引修改指定页的文字内容
+
+        Args:
+            slide_number: 页码（从1开始）
+            replacements: 字典，格式 {形状索引: {段落索引: {run索引: '新文字'}}}
+            font_size: 被替换run的字号（pt）
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self._check_slide_number(slide_number):
+            return False
+
+        slide = self.prs.slides[slide_number - 1]
+        if not self._fill_by_index(slide, replacements, font_size):
+            return False
+
+        print(f"已修改第 {slide_number} 页")
+        return True
+
+    def _fill_by_index(self, slide, replacements, font_size, verbose=True):
+        """按 形状/段落/run 索引填写一页的文字（见 set_pptx_page_texts_by_slides_shapes_index）"""
+        self._invalidate(slide)
+
+        for shape_index, run_replacements in replacements.items():
+            if not slide.shapes[shape_index].has_text_frame:
+                print(f"错误：形状索引 {shape_index} 不包含文本框")
+                return False
+            shape = slide.shapes[shape_index]
+            for paragraph_index, new_texts_index in run_replacements.items():
+                paragraph = shape.text_frame.paragraphs[paragraph_index]
+                if verbose:
+                    print(f"Shape {shape_index} paragraph {paragraph_index}")
+                for run_index, new_text in new_texts_index.items():
+                    if run_index < len(paragraph.runs):
+                        if verbose:
+                            print(f" original text {paragraph.runs[run_index].text} new text: {new_text}")
+                        paragraph.runs[run_index].text = new_text
+                        paragraph.runs[run_index].font.bold = True
+                        paragraph.runs[run_index].font.size = Pt(font_size)
+                    else:
+                        if verbose:
+                            print(f" append new text on {run_index}: {new_text}")
+                        new_run = paragraph.add_run()
+                        new_run.text = " " + new_text
+                        # 新增行时，字体加粗、字号20pt，字体固定为STXingkai
+                        new_run.font.bold = True
+                        new_run.font.size = Pt(20)
+                        new_run.font.name = "STXingkai"
+        return True
+
+    def show_structure_one_page(self, slide_number):
+        """
+        打印指定页的 形状/段落/run 索引结构
+
+        Args:
+            slide_number: 页码（从1开始）
+        """
+        if not self._check_slide_number(slide_number):
+            return False
+
+        slide = self.prs.slides[slide_number - 1]
+
+        for i, shape in enumerate(slide.shapes):
+            print(f"Shape index: {i}")
+            if shape.has_text_frame:
+                for j, paragraph in enumerate(shape.text_frame.paragraphs):
+                    print(f"  Paragraph index: {j}")
+                    for k, run in enumerate(paragraph.runs):
+                        print(f"     text index : {k} : {run.text}", end="|\n")
+        return True
+
+    def delete_slide(self, slide_number):
+        """
+        删除指定页
+
+        Args:
+            slide_number: 要删除的页码（从1开始）
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self._check_slide_number(slide_number):
+            return False
+
+        rId = self.prs.slides._sldIdLst[slide_number - 1].rId
+        self.prs.part.drop_rel(rId)
+        del self.prs.slides._sldIdLst[slide_number - 1]
+        # 其他页跳转到被删除页的链接一并去掉，否则被删除的页仍会被保存，且与重新编号后的页重名
+        deck_compact.drop_slide_links(self.prs)
+        self._renumber_slide_parts()
+
+        print(f"已删除第 {slide_number} 页")
+        return True
+
+    def delete_slides(self, slide_numbers):
+        """
+        批量删除多页
+
+        Args:
+            slide_numbers: 要删除的页码列表（从1开始），如 [2, 5, 7]
+
+        Returns:
+            bool: 是否成功
+        """
+        # 从大到小排序，从后往前删除，避免索引变化
+        for slide_number in sorted(slide_numbers, reverse=True):
+            if slide_number < 1 or slide_number > len(self.prs.slides):
+                print(f"警告：页码 {slide_number} 超出范围（共 {len(self.prs.slides)} 页），跳过")
+                continue
+
+            rId = self.prs.slides._sldIdLst[slide_number - 1].rId
+            self.prs.part.drop_rel(rId)
+            del self.prs.slides._sldIdLst[slide_number - 1]
+            print(f"已删除第 {slide_number} 页")
+
+        deck_compact.drop_slide_links(self.prs)
+        self._renumber_slide_parts()
+        return True
+
+    def _clone_slides(self, counts):
+        """
+        复制幻灯片：每页的XML只序列化一次，再按需要的份数解析成新的幻灯片部件，
+        副本紧跟在原页后面，所有副本添加完后只重排一次 sldIdLst
+
+        副本与原页完全相同（不会像 add_slide 那样再加上版式中的空占位符），
+        并与原页指向同样的图片、媒体等部件（只增加关系，不复制数据），见 _copy_relationships。
+
+        Args:
+            counts: 字典，格式 {页码: 副本数}
+
+        Returns:
+            dict: {页码: [副本幻灯片, ...]}
+        """
+        prs_part = self.prs.part
+        xml_slides = self.prs.slides._sldIdLst
+        originals = list(xml_slides)
+        copies = {}
+        for slide_number, count in counts.items():
+            source_slide = self.prs.slides[slide_number - 1]
+            xml = etree.tostring(source_slide._element)
+            copies[slide_number] = []
+            for _ in range(count):
+                partname = prs_part.package.next_partname('/ppt/slides/slide%d.xml')
+                slide_part = SlidePart(partname, CT.PML_SLIDE, prs_part.package, parse_xml(xml))
+                _remap_rids(slide_part._element, _copy_relationships(source_slide.part, slide_part))
+                sldId = xml_slides.add_sldId(prs_part.relate_to(slide_part, RT.SLIDE))
+                copies[slide_number].append((sldId, slide_part.slide))
+
+        order = []
+        for slide_number, sldId in enumerate(originals, 1):
+            order.append(sldId)
+            order.extend(copy_id for copy_id, _ in copies.get(slide_number, ()))
+        self._arrange(order)
+        return {slide_number: [slide for _, slide in slides] for slide_number, slides in copies.items()}
+
+    def clone_slide(self, slide_number, fills, font_size=33):
+        """
+        以指定页为模板生成多页：模板页填写第一组文字，其余各组各复制一页填写，依次排在模板页后面
+
+        例如一段经文分为多页时，模板只序列化一次，所有页一次生成、一次排好顺序。
+
+        Args:
+            slide_number: 模板页码（从1开始）
+            fills: 列表，每项为一页的 {形状索引: {段落索引: {run索引: '新文字'}}}，
+                   格式与 set_pptx_page_texts_by_slides_shapes_index 相同
+            font_size: 被替换run的字号（pt）
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self._check_slide_number(slide_number):
+            return False
+        fills = list(fills)
+        if not fills:
+            print("错误：至少需要一组文字")
+            return False
+
+        slides = [self.prs.slides[slide_number - 1]]
+        if len(fills) > 1:
+            slides += self._clone_slides({slide_number: len(fills) - 1})[slide_number]
+        for slide, replacements in zip(slides, fills):
+            if not self._fill_by_index(slide, replacements, font_size, verbose=False):
+                return False
+
+        print(f"已由第 {slide_number} 页生成第 {slide_number} 至 {slide_number + len(fills) - 1} 页")
+        return True
+
+    def duplicate_slide(self, slide_number):
+        """
+        复制指定页并插入到该页后面
+
+        Args:
+            slide_number: 要复制的页码（从1开始）
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self._check_slide_number(slide_number):
+            return False
+        self._clone_slides({slide_number: 1})
+        print(f"已在第 {slide_number} 页后插入副本")
+        return True
+
+    def duplicate_slides(self, slide_numbers):
+        """
+        批量复制多页并插入到各自后面
+
+        Args:
+            slide_numbers: 要复制的页码列表（从1开始），如 [2, 5]
+
+        Returns:
+            bool: 是否成功
+        """
+        counts = Counter()
+        for slide_number in sorted(slide_numbers, reverse=True):
+            if slide_number < 1 or slide_number > len(self.prs.slides):
+                print(f"警告：页码 {slide_number} 超出范围（共 {len(self.prs.slides)} 页），跳过")
+                continue
+            counts[slide_number] += 1
+            print(f"已在第 {slide_number} 页后插入副本")
+        # 所有副本一次添加，最后统一排序，不会因索引变化而错位
+        self._clone_slides(counts)
+        return True
+
+    def _ordered(self, order):
+        """按已检查过的页码顺序重排，不输出信息"""
+        sldIds = list(self.prs.slides._sldIdLst)
+        self._arrange([sldIds[number - 1] for number in order])
+
+    def reorder_slides(self, order):
+        """
+        按新的顺序重排所有幻灯片
+
+        先检查整个顺序，再一次性重排 sldIdLst；多次交换、移动可以合并为一次调用。
+
+        Args:
+            order: 原页码（从1开始）按新顺序排列的列表，必须包含每一页且各一次，
+                   如共5页时 [1, 2, 4, 3, 5] 表示交换第3、4页
+
+        Returns:
+            bool: 是否成功
+        """
+        order = list(order)
+        count = len(self.prs.slides)
+        seen = Counter(order)
+        missing = [number for number in range(1, count + 1) if number not in seen]
+        extra = sorted(number for number, n in seen.items() if n > 1 or not 1 <= number <= count)
+        if missing or extra:
+            print(f"错误：新顺序必须包含第 1 至 {count} 页且各一次"
+                  + (f"，缺少第 {', '.join(map(str, missing))} 页" if missing else "")
+                  + (f"，多余或重复第 {', '.join(map(str, extra))} 页" if extra else ""))
+            return False
+
+        self._ordered(order)
+        print("已重排幻灯片顺序")
+        return True
+
+    def move_slides(self, moves):
+        """
+        一次移动多页：被移动的页放到指定的最终页码，其余页按原顺序依次填充剩下的位置
+
+        Args:
+            moves: 字典，格式 {原页码: 新页码}，页码从1开始，新页码不能重复
+
+        Returns:
+            bool: 是否成功
+
+        Example:
+            deck.move_slides({14: 12, 3: 1})    # 第14页移到第12页，第3页移到第1页
+        """
+        count = len(self.prs.slides)
+        for slide_number in moves:
+            if not self._check_slide_number(slide_number):
+                return False
+        targets = {}
+        for slide_number, position in moves.items():
+            if position < 1 or position > count:
+                print(f"错误：目标页码 {position} 超出范围（共 {count} 页）")
+                return False
+            if position in targets:
+                print(f"错误：第 {targets[position]} 页和第 {slide_number} 页不能都移到第 {position} 页")
+                return False
+            targets[position] = slide_number
+
+        rest = iter(number for number in range(1, count + 1) if number not in moves)
+        self._ordered([targets[position] if position in targets else next(rest)
+                       for position in range(1, count + 1)])
+        for slide_number, position in moves.items():
+            print(f"已将第 {slide_number} 页移到第 {position} 页")
+        return True
+
+    def swap_slides(self, slide_num1, slide_num2):
+        """
+        交换两个幻灯片的位置
+
+        Args:
+            slide_num1: 第一个页码（从1开始）
+            slide_num2: 第二个页码（从1开始）
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self._check_slide_number(slide_num1) or not self._check_slide_number(slide_num2):
+            return False
+
+        if slide_num1 == slide_num2:
+            print("错误：两个页码不能相同")
+            return False
+
+        order = list(range(1, len(self.prs.slides) + 1))
+        order[slide_num1 - 1], order[slide_num2 - 1] = slide_num2, slide_num1
+        self._ordered(order)
+
+        print(f"已交换第 {slide_num1} 页和第 {slide_num2} 页")
+        return True
+
+    def _add_video_slide(self, layout, video_path, link):
+        """在末尾添加一页全屏视频幻灯片"""
+        new_slide = self.prs.slides.add_slide(layout)
+
+        # 视频位置：左上角(0,0)，尺寸：填满整个幻灯片
+        # 同一视频已经在PPT中时只增加关系，不再保存一份
+        deck_media.add_movie(
+            new_slide.shapes, self.media_index,
+            video_path,
+            Inches(0), Inches(0), self.prs.slide_width, self.prs.slide_height,
+            poster_frame_image=None,  # 不使用海报帧，使用视频第一帧
+            mime_type='video/mp4',
+            link=deck_media.link_target(video_path, self.output_file) if link else None
+        )
+        return new_slide
+
+    def insert_fullscreen_video_slide(self, video_path, insert_position=None, link=False):
+        """
+        插入一个新的全屏视频幻灯片
+
+        Args:
+            video_path: 视频文件路径
+            insert_position: 插入位置（从1开始），如果为None则在末尾添加
+            link: 为True时不嵌入视频，只按相对于输出文件的路径链接（PPT很小，保存、复制都很快），
+                  放映的电脑上视频必须在同样的相对位置，可用 generate_ppt.check_linked_videos 检查
+
+        Returns:
+            bool: 是否成功
+        """
+        if not os.path.exists(video_path):
+            print(f"错误：找不到视频文件 {video_path}")
+            return False
+
+        # 先检查插入位置，避免失败时留下一页空白幻灯片
+        if insert_position is not None and (insert_position < 1 or insert_position > len(self.prs.slides) + 1):
+            print(f"错误：插入位置 {insert_position} 超出范围（共 {len(self.prs.slides) + 1} 页）")
+            return False
+
+        # 添加一个空白幻灯片（使用空白布局）
+        blank_slide_layout = self.prs.slide_layouts[6]  # 6通常是空白布局
+        self._add_video_slide(blank_slide_layout, video_path, link)
+
+        # 如果指定了插入位置，则移动到该位置
+        if insert_position is not None:
+            self._move_last_slide(insert_position - 1)
+
+        position_str = f"第 {insert_position} 页" if insert_position else "末尾"
+        print(f"已在 {position_str} 插入全屏视频幻灯片" + ("（链接）" if link else ""))
+        return True
+
+    def insert_video_slides(self, videos, link=False):
+        """
+        一次插入多个全屏视频幻灯片（如整个诗歌列表）
+
+        先检查所有文件和页码，空白布局只查找一次，每个视频文件只处理一次
+        （重复的视频共用一个媒体部件），最后一次性排好所有幻灯片的顺序。
+
+        Args:
+            videos: [(页码, 视频文件路径), ...]；页码是插入后该视频页在PPT中的最终页码（从1开始），
+                    为None时依次添加在末尾。结果与按页码从小到大逐个调用
+                    insert_fullscreen_video_slide 相同
+            link: 为True时不嵌入视频，只链接（见 insert_fullscreen_video_slide）
+
+        Returns:
+            bool: 是否成功
+        
+        Example:
+            deck.insert_video_slides([(16, 'musics/4.mp4'), (18, 'musics/7.mp4'), (None, 'musics/1.mp4')])
+        """
+        videos = list(videos)
+        total = len(self.prs.slides) + len(videos)
+        positions = set()
+        for position, video_path in videos:
+            if not os.path.exists(video_path):
+                print(f"错误：找不到视频文件 {video_path}")
+                return False
+            if position is None:
+                continue
+            if position < 1 or position > total:
+                print(f"错误：插入位置 {position} 超出范围（插入后共 {total} 页）")
+                return False
+            if position in positions:
+                print(f"错误：插入位置 {position} 重复")
+                return False
+            positions.add(position)
+
+        blank_slide_layout = self.prs.slide_layouts[6]  # 6通常是空白布局
+        xml_slides = self.prs.slides._sldIdLst
+        existing = list(xml_slides)
+        placed = {}
+        appended = []
+        for position, video_path in videos:
+            self._add_video_slide(blank_slide_layout, video_path, link)
+            if position is None:
+                appended.append(xml_slides[-1])
+            else:
+                placed[position] = xml_slides[-1]
+
+        # 未指定页码的位置依次放原有幻灯片，再放末尾添加的视频页
+        rest = iter(existing + appended)
+        order = [placed[number] if number in placed else next(rest) for number in range(1, total + 1)]
+        self._arrange(order)
+
+        inserted = set(placed.values()).union(appended)
+        pages = [number for number, sldId in enumerate(order, 1) if sldId in inserted]
+        print(f"已插入 {len(videos)} 个全屏视频幻灯片：第 {', '.join(map(str, pages))} 页" + ("（链接）" if link else ""))
+        return True
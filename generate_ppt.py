@@ -1,49 +1,47 @@
 from pptx import Presentation
 import os
+import sys
 import get_bibles
-import copy
-from pptx.util import Pt
+import pptx_reader
+from deck_session import DeckSession
 
-def read_pptx(pptx_file):
+# 下面各函数保存文件时使用的压缩方案（见 pptx_writer.PROFILES）：
+# 连续调用多个函数编辑时可设为 'draft'，最后一次保存前改为 'final'
+save_profile = 'default'
+# 为True时保存前先去掉已删除的页、视频等留下的无用部件（见 DeckSession.compact）
+save_compact = False
+
+def read_pptx(pptx_file, fast=True):
     """
     读取现有的PPTX文件并返回所有内容信息
     
     Args:
         pptx_file: PPTX文件路径
+        fast: 为True时直接流式解析zip中的幻灯片XML（pptx_reader），
+              为False时通过 python-pptx 对象读取，两者结果相同
     
     Returns:
-        dict: 包含PPT所有信息的字典
+        pptx_reader.DeckInfo: 包含PPT所有信息，to_dict() / to_json() 转换为原来的字典格式
     """
     if not os.path.exists(pptx_file):
         print(f"错误：找不到文件 {pptx_file}")
         return None
     
+    if fast:
+        return pptx_reader.read_deck(pptx_file)
+    
     prs = Presentation(pptx_file)
-    ppt_info = {
-        'slide_count': len(prs.slides),
-        'slides': []
-    }
+    slides = []
     
     # 遍历所有幻灯片
     for slide_num, slide in enumerate(prs.slides, 1):
-        slide_info = {
-            'slide_number': slide_num,
-            'title': '',
-            'shapes': []
-        }
-        
         # 获取标题
-        if slide.shapes.title:
-            slide_info['title'] = slide.shapes.title.text
+        title = slide.shapes.title.text if slide.shapes.title else ''
         
         # 遍历所有形状
+        shapes = []
         for shape_num, shape in enumerate(slide.shapes):
-            shape_info = {
-                'shape_number': shape_num,
-                'type': str(shape.shape_type),
-                'has_text': shape.has_text_frame,
-                'text': ''
-            }
+            text = ''
             
             # 获取文本内容
             if shape.has_text_frame:
@@ -51,68 +49,88 @@ def read_pptx(pptx_file):
                 for paragraph in shape.text_frame.paragraphs:
                     for run in paragraph.runs:
                         text_parts.append(run.text)
-                shape_info['text'] = ''.join(text_parts)
+                text = ''.join(text_parts)
             
-            slide_info['shapes'].append(shape_info)
+            shapes.append(pptx_reader.ShapeInfo(shape_num, shape.shape_type, shape.has_text_frame, text))
         
-        ppt_info['slides'].append(slide_info)
+        slides.append(pptx_reader.SlideInfo(slide_num, title, shapes))
     
-    return ppt_info
+    return pptx_reader.DeckInfo(slides)
 
 
-def update_pptx_text(pptx_file, output_file, replacements):
+def _run_in_session(pptx_file, output_file, operation, *args):
     """
-    修改PPTX文件中的文字
-    
+    打开PPT，执行一项 DeckSession 操作后保存
+
     Args:
         pptx_file: 原PPTX文件路径
-        output_file: 输出PPTX文件路径
-        replacements: 字典，格式 {'旧文字': '新文字'}
+        output_file: 输出PPTX文件路径，为None时只执行不保存
+        operation: DeckSession 的方法名
+    
+    Returns:
+        bool: 是否成功
     """
     if not os.path.exists(pptx_file):
         print(f"错误：找不到文件 {pptx_file}")
         return False
     
-    prs = Presentation(pptx_file)
+    deck = DeckSession(pptx_file, output_file, save_profile, save_compact)
+    if not getattr(deck, operation)(*args):
+        return False
     
-    # 遍历所有幻灯片
-    for slide in prs.slides:
-        for shape in slide.shapes:
-            if shape.has_text_frame:
-                for paragraph in shape.text_frame.paragraphs:
-                    for run in paragraph.runs:
-                        # 进行替换
-                        for old_text, new_text in replacements.items():
-                            if old_text in run.text:
-                                run.text = run.text.replace(old_text, new_text)
-    
-    # 保存
-    prs.save(output_file)
-    print(f"PPT文件已保存: {output_file}")
+    if output_file is not None:
+        deck.save()
     return True
 
 
+def update_pptx_text(pptx_file, output_file, replacements):
+    """
+    修改PPTX文件中的文字
+    
+    Args:
+        pptx_file: 原PPTX文件路径
+        output_file: 输出PPTX文件路径
+        replacements: 字典，格式 {'旧文字': '新文字'}
+    """
+    return _run_in_session(pptx_file, output_file, 'update_pptx_text', replacements)
+
+
 def print_pptx_info(ppt_info):
     """
     打印PPT信息
     
     Args:
-        ppt_info: read_pptx函数返回的信息字典
+        ppt_info: read_pptx函数返回的 DeckInfo（或原来的字典格式），或PPTX文件路径（逐页读取，不构建整个 DeckInfo）
     """
     if not ppt_info:
         return
     
-    print(f"总共 {ppt_info['slide_count']} 页")
+    if isinstance(ppt_info, str):
+        if not os.path.exists(ppt_info):
+            print(f"错误：找不到文件 {ppt_info}")
+            return
+        slide_count = pptx_reader.slide_count(ppt_info)
+        slides = pptx_reader.iter_slides(ppt_info)
+    else:
+        ppt_info = pptx_reader.DeckInfo.from_dict(ppt_info)
+        slide_count, slides = ppt_info.slide_count, ppt_info.slides
+    
+    print(f"总共 {slide_count} 页")
     print("=" * 60)
     
-    for slide_info in ppt_info['slides']:
-        print(f"\n第 {slide_info['slide_number']} 页")
-        print(f"标题: {slide_info['title']}")
-        print(f"形状数量: {len(slide_info['shapes'])}")       
-        for shape_info in slide_info['shapes']:
-            
-            if shape_info['has_text'] and shape_info['text']:
-                print(f"  - 文本: {shape_info['text']}...")
+    for slide_info in slides:
+        _print_slide(slide_info)
+
+
+def _print_slide(slide_info):
+    """打印一页的信息"""
+    print(f"\n第 {slide_info.slide_number} 页")
+    print(f"标题: {slide_info.title}")
+    print(f"形状数量: {len(slide_info.shapes)}")       
+    for shape_info in slide_info.shapes:
+        
+        if shape_info.has_text and shape_info.text:
+            print(f"  - 文本: {shape_info.text}...")
 
 
 def print_pptx_page(ppt_info, page_number):
@@ -120,24 +138,29 @@ def print_pptx_page(ppt_info, page_number):
     打印PPT信息
     
     Args:
-        ppt_info: read_pptx函数返回的信息字典
+        ppt_info: read_pptx函数返回的 DeckInfo（或原来的字典格式），或PPTX文件路径（只解析这一页）
+        page_number: 页码（从1开始）
     """
     if not ppt_info:
         return
     
-    print(f"总共 {ppt_info['slide_count']} 页")
+    if isinstance(ppt_info, str):
+        if not os.path.exists(ppt_info):
+            print(f"错误：找不到文件 {ppt_info}")
+            return
+        slide_count, slide_info = pptx_reader.read_slide(ppt_info, page_number)
+        slides = [slide_info] if slide_info else []
+    else:
+        ppt_info = pptx_reader.DeckInfo.from_dict(ppt_info)
+        slide_count, slides = ppt_info.slide_count, ppt_info.slides
+    
+    print(f"总共 {slide_count} 页")
     print("=" * 60)
     
-    for slide_info in ppt_info['slides']:
-        if slide_info['slide_number'] != page_number:
+    for slide_info in slides:
+        if slide_info.slide_number != page_number:
             continue
-        print(f"\n第 {slide_info['slide_number']} 页")
-        print(f"标题: {slide_info['title']}")
-        print(f"形状数量: {len(slide_info['shapes'])}")       
-        for shape_info in slide_info['shapes']:
-            
-            if shape_info['has_text'] and shape_info['text']:
-                print(f"  - 文本: {shape_info['text']}...")
+        _print_slide(slide_info)
 
 
 def update_slide_text(pptx_file, output_file, slide_number, replacements):
@@ -153,36 +176,7 @@ def update_slide_text(pptx_file, output_file, slide_number, replacements):
     Returns:
         bool: 是否成功
     """
-    if not os.path.exists(pptx_file):
-        print(f"错误：找不到文件 {pptx_file}")
-        return False
-    
-    prs = Presentation(pptx_file)
-    
-    # 检查页码是否有效
-    if slide_number < 1 or slide_number > len(prs.slides):
-        print(f"错误：页码 {slide_number} 超出范围（共 {len(prs.slides)} 页）")
-        return False
-    
-    # 获取指定页（索引从0开始）
-    slide = prs.slides[slide_number - 1]
-    
-    # 遍历该页的所有形状
-    for shape in slide.shapes:
-        if shape.has_text_frame:
-            for paragraph in shape.text_frame.paragraphs:
-                for run in paragraph.runs:
-                    # 进行替换
-                    for old_text, new_text in replacements.items():
-                        #print(f"Before {run.text} → {run.text.replace(old_text, new_text)}")
-                        if old_text in run.text:
-                            run.text = run.text.replace(old_text, new_text)
-                        #print(f"After {run.text}")
-    
-    # 保存
-    prs.save(output_file)
-    print(f"已修改第 {slide_number} 页，文件已保存: {output_file}")
-    return True
+    return _run_in_session(pptx_file, output_file, 'update_slide_text', slide_number, replacements)
 
 
 def update_multiple_slides(pptx_file, output_file, slide_replacements):
@@ -204,38 +198,7 @@ def update_multiple_slides(pptx_file, output_file, slide_replacements):
     Returns:
         bool: 是否成功
     """
-    if not os.path.exists(pptx_file):
-        print(f"错误：找不到文件 {pptx_file}")
-        return False
-    
-    prs = Presentation(pptx_file)
-    
-    # 遍历需要修改的页
-    for slide_number, replacements in slide_replacements.items():
-        # 检查页码是否有效
-        if slide_number < 1 or slide_number > len(prs.slides):
-            print(f"警告：页码 {slide_number} 超出范围（共 {len(prs.slides)} 页），跳过")
-            continue
-        
-        # 获取指定页
-        slide = prs.slides[slide_number - 1]
-        
-        # 遍历该页的所有形状
-        for shape in slide.shapes:
-            if shape.has_text_frame:
-                for paragraph in shape.text_frame.paragraphs:
-                    for run in paragraph.runs:
-                        # 进行替换
-                        for old_text, new_text in replacements.items():
-                            if old_text in run.text:
-                                run.text = run.text.replace(old_text, new_text)
-        
-        print(f"已修改第 {slide_number} 页")
-    
-    # 保存
-    prs.save(output_file)
-    print(f"所有修改完成，文件已保存: {output_file}")
-    return True
+    return _run_in_session(pptx_file, output_file, 'update_multiple_slides', slide_replacements)
 
 
 def delete_slide(pptx_file, output_file, slide_number):
@@ -250,26 +213,7 @@ def delete_slide(pptx_file, output_file, slide_number):
     Returns:
         bool: 是否成功
     """
-    if not os.path.exists(pptx_file):
-        print(f"错误：找不到文件 {pptx_file}")
-        return False
-    
-    prs = Presentation(pptx_file)
-    
-    # 检查页码是否有效
-    if slide_number < 1 or slide_number > len(prs.slides):
-        print(f"错误：页码 {slide_number} 超出范围（共 {len(prs.slides)} 页）")
-        return False
-    
-    # 获取要删除的幻灯片
-    rId = prs.slides._sldIdLst[slide_number - 1].rId
-    prs.part.drop_rel(rId)
-    del prs.slides._sldIdLst[slide_number - 1]
-    
-    # 保存
-    prs.save(output_file)
-    print(f"已删除第 {slide_number} 页，文件已保存: {output_file}")
-    return True
+    return _run_in_session(pptx_file, output_file, 'delete_slide', slide_number)
 
 
 def delete_slides(pptx_file, output_file, slide_numbers):
@@ -284,31 +228,7 @@ def delete_slides(pptx_file, output_file, slide_numbers):
     Returns:
         bool: 是否成功
     """
-    if not os.path.exists(pptx_file):
-        print(f"错误：找不到文件 {pptx_file}")
-        return False
-    
-    prs = Presentation(pptx_file)
-    
-    # 从大到小排序，从后往前删除，避免索引变化
-    slide_numbers_sorted = sorted(slide_numbers, reverse=True)
-    
-    for slide_number in slide_numbers_sorted:
-        # 检查页码是否有效
-        if slide_number < 1 or slide_number > len(prs.slides):
-            print(f"警告：页码 {slide_number} 超出范围（共 {len(prs.slides)} 页），跳过")
-            continue
-        
-        # 删除幻灯片
-        rId = prs.slides._sldIdLst[slide_number - 1].rId
-        prs.part.drop_rel(rId)
-        del prs.slides._sldIdLst[slide_number - 1]
-        print(f"已删除第 {slide_number} 页")
-    
-    # 保存
-    prs.save(output_file)
-    print(f"所有删除完成，文件已保存: {output_file}")
-    return True
+    return _run_in_session(pptx_file, output_file, 'delete_slides', slide_numbers)
 
 
 def duplicate_slides(pptx_file, output_file, slide_numbers):
@@ -323,61 +243,16 @@ def duplicate_slides(pptx_file, output_file, slide_numbers):
     Returns:
         bool: 是否成功
     """
-    import copy
-    
-    if not os.path.exists(pptx_file):
-        print(f"错误：找不到文件 {pptx_file}")
-        return False
-    
-    prs = Presentation(pptx_file)
-    
-    # 从大到小排序，从后往前处理，避免索引变化
-    slide_numbers_sorted = sorted(slide_numbers, reverse=True)
-    
-    for slide_number in slide_numbers_sorted:
-        # 检查页码是否有效
-        if slide_number < 1 or slide_number > len(prs.slides):
-            print(f"警告：页码 {slide_number} 超出范围（共 {len(prs.slides)} 页），跳过")
-            continue
-        
-        # 获取要复制的幻灯片
-        source_slide = prs.slides[slide_number - 1]
-        
-        # 获取布局
-        slide_layout = source_slide.slide_layout
-        
-        # 创建新幻灯片
-        new_slide = prs.slides.add_slide(slide_layout)
-        
-        # 深度复制所有形状
-        for shape in source_slide.shapes:
-            el = shape.element
-            newel = copy.deepcopy(el)
-            new_slide.shapes._spTree.insert_element_before(newel, 'p:extLst')
-        
-        # 移动到正确位置
-        xml_slides = prs.slides._sldIdLst
-        slides = list(xml_slides)
-        xml_slides.remove(slides[-1])
-        xml_slides.insert(slide_number, slides[-1])
-        
-        print(f"已在第 {slide_number} 页后插入副本")
-    
-    # 保存
-    prs.save(output_file)
-    print(f"所有复制完成，文件已保存: {output_file}")
-    return True
+    return _run_in_session(pptx_file, output_file, 'duplicate_slides', slide_numbers)
 
 
 def show_structure_one_page(pptx_file, slide_number):
     """
-    修改指定页的文字内容
+    打印指定页的 形状/段落/run 索引结构（只读取这一页的XML，不打开整个PPT）
     
     Args:
-        pptx_file: 原PPTX文件路径
-        output_file: 输出PPTX文件路径
+        pptx_file: PPTX文件路径
         slide_number: 页码（从1开始）
-        indexed_replacements: 字典，格式 {索引: '新文字'}
     
     Returns:
         bool: 是否成功
@@ -386,26 +261,19 @@ def show_structure_one_page(pptx_file, slide_number):
         print(f"错误：找不到文件 {pptx_file}")
         return False
     
-    prs = Presentation(pptx_file)
-    
-    # 检查页码是否有效
-    if slide_number < 1 or slide_number > len(prs.slides):
-        print(f"错误：页码 {slide_number} 超出范围（共 {len(prs.slides)} 页）")
+    slide_count, structure = pptx_reader.read_structure(pptx_file, slide_number)
+    if structure is None:
+        print(f"错误：页码 {slide_number} 超出范围（共 {slide_count} 页）")
         return False
     
-    # 获取指定页（索引从0开始）
-    slide = prs.slides[slide_number - 1]  
-    
-    for i in range(len(slide.shapes)):
-        shape = slide.shapes[i]
+    for i, paragraphs in enumerate(structure):
         print(f"Shape index: {i}")
-        if slide.shapes[i].has_text_frame:
-            for j in range(len(slide.shapes[i].text_frame.paragraphs)):
-                paragraph = slide.shapes[i].text_frame.paragraphs[j]
+        if paragraphs is not None:
+            for j, runs in enumerate(paragraphs):
                 print(f"  Paragraph index: {j}")
-                for k in range(len(paragraph.runs)):
-                    run = paragraph.runs[k]
-                    print(f"     text index : {k} : {run.text}", end="|\n")
+                for k, text in enumerate(runs):
+                    print(f"     text index : {k} : {text}", end="|\n")
+    return True
 
 
 def duplicate_slide(pptx_file, output_file, slide_number):
@@ -420,44 +288,25 @@ def duplicate_slide(pptx_file, output_file, slide_number):
     Returns:
         bool: 是否成功
     """
-    import copy
-    
-    if not os.path.exists(pptx_file):
-        print(f"错误：找不到文件 {pptx_file}")
-        return False
-    
-    prs = Presentation(pptx_file)
-    
-    # 检查页码是否有效
-    if slide_number < 1 or slide_number > len(prs.slides):
-        print(f"错误：页码 {slide_number} 超出范围（共 {len(prs.slides)} 页）")
-        return False
-    
-    # 获取要复制的幻灯片
-    source_slide = prs.slides[slide_number - 1]
-    
-    # 获取布局
-    slide_layout = source_slide.slide_layout
-    
-    # 创建新幻灯片
-    new_slide = prs.slides.add_slide(slide_layout)
-    
-    # 深度复制所有形状
-    for shape in source_slide.shapes:
-        el = shape.element
-        newel = copy.deepcopy(el)
-        new_slide.shapes._spTree.insert_element_before(newel, 'p:extLst')
+    return _run_in_session(pptx_file, output_file, 'duplicate_slide', slide_number)
+
+
+def clone_slide(pptx_file, output_file, slide_number, fills, font_size=33):
+    """
+    以指定页为模板生成多页（如多段经文）：模板页填写第一组文字，其余各组各复制一页，
+    只读取和保存一次
     
-    # 移动到正确位置（紧跟在原页面后）
-    xml_slides = prs.slides._sldIdLst
-    slides = list(xml_slides)
-    xml_slides.remove(slides[-1])
-    xml_slides.insert(slide_number, slides[-1])
+    Args:
+        pptx_file: 原PPTX文件路径
+        output_file: 输出PPTX文件路径
+        slide_number: 模板页码（从1开始）
+        fills: 列表，每项为一页的 {形状索引: {段落索引: {run索引: '新文字'}}}
+        font_size: 被替换run的字号（pt）
     
-    # 保存
-    prs.save(output_file)
-    print(f"已在第 {slide_number} 页后插入副本，文件已保存: {output_file}")
-    return True
+    Returns:
+        bool: 是否成功
+    """
+    return _run_in_session(pptx_file, output_file, 'clone_slide', slide_number, fills, font_size)
 
 
 def swap_slides(pptx_file, output_file, slide_num1, slide_num2):
@@ -473,115 +322,106 @@ def swap_slides(pptx_file, output_file, slide_num1, slide_num2):
     Returns:
         bool: 是否成功
     """
-    if not os.path.exists(pptx_file):
-        print(f"错误：找不到文件 {pptx_file}")
-        return False
-    
-    prs = Presentation(pptx_file)
+    return _run_in_session(pptx_file, output_file, 'swap_slides', slide_num1, slide_num2)
+
+
+def reorder_slides(pptx_file, output_file, order):
+    """
+    按新的顺序重排所有幻灯片（多次交换、移动只需读取和保存一次）
     
-    # 检查页码是否有效
-    if slide_num1 < 1 or slide_num1 > len(prs.slides):
-        print(f"错误：页码 {slide_num1} 超出范围（共 {len(prs.slides)} 页）")
-        return False
-    if slide_num2 < 1 or slide_num2 > len(prs.slides):
-        print(f"错误：页码 {slide_num2} 超出范围（共 {len(prs.slides)} 页）")
-        return False
+    Args:
+        pptx_file: 原PPTX文件路径
+        output_file: 输出PPTX文件路径
+        order: 原页码（从1开始）按新顺序排列的列表，必须包含每一页且各一次
     
-    if slide_num1 == slide_num2:
-        print("错误：两个页码不能相同")
-        return False
+    Returns:
+        bool: 是否成功
+    """
+    return _run_in_session(pptx_file, output_file, 'reorder_slides', order)
+
+
+def move_slides(pptx_file, output_file, moves):
+    """
+    一次移动多页，其余页按原顺序依次排在剩下的位置
     
-    # 转换为0开始的索引
-    idx1 = slide_num1 - 1
-    idx2 = slide_num2 - 1
+    Args:
+        pptx_file: 原PPTX文件路径
+        output_file: 输出PPTX文件路径
+        moves: 字典，格式 {原页码: 新页码}，如 {14: 12}
     
-    # 获取XML中的slides列表
-    xml_slides = prs.slides._sldIdLst
-    slides = list(xml_slides)
+    Returns:
+        bool: 是否成功
+    """
+    return _run_in_session(pptx_file, output_file, 'move_slides', moves)
+
+
+def insert_fullscreen_video_slide(pptx_file, output_file, video_path, insert_position=None, link=False):
+    """
+    插入一个新的全屏视频幻灯片
     
-    # 交换位置
-    slides[idx1], slides[idx2] = slides[idx2], slides[idx1]
+    Args:
+        pptx_file: 原PPTX文件路径
+        output_file: 输出PPTX文件路径
+        video_path: 视频文件路径
+        insert_position: 插入位置（从1开始），如果为None则在末尾添加
+        link: 为True时不嵌入视频，只链接到相对于输出文件的路径
     
-    # 清空并重新添加
-    for slide in list(xml_slides):
-        xml_slides.remove(slide)
+    Returns:
+        bool: 是否成功
+    """
+    return _run_in_session(pptx_file, output_file, 'insert_fullscreen_video_slide', video_path, insert_position, link)
+
+
+def insert_video_slides(pptx_file, output_file, videos, link=False):
+    """
+    一次插入多个全屏视频幻灯片，只读取和保存一次
     
-    for slide in slides:
-        xml_slides.append(slide)
+    Args:
+        pptx_file: 原PPTX文件路径
+        output_file: 输出PPTX文件路径
+        videos: [(页码, 视频文件路径), ...]，页码为插入后的最终页码（从1开始），为None时添加在末尾
+        link: 为True时不嵌入视频，只链接到相对于输出文件的路径
     
-    # 保存
-    prs.save(output_file)
-    print(f"已交换第 {slide_num1} 页和第 {slide_num2} 页，文件已保存: {output_file}")
-    return True
+    Returns:
+        bool: 是否成功
+    """
+    return _run_in_session(pptx_file, output_file, 'insert_video_slides', videos, link)
 
 
-def insert_fullscreen_video_slide(pptx_file, output_file, video_path, insert_position=None):
+def compact_pptx(pptx_file, output_file):
     """
-    插入一个新的全屏视频幻灯片
+    整理PPT：去掉已删除的页、被替换的视频等留下的无用部件，输出更小的文件
     
     Args:
         pptx_file: 原PPTX文件路径
         output_file: 输出PPTX文件路径
-        video_path: 视频文件路径
-        insert_position: 插入位置（从1开始），如果为None则在末尾添加
     
     Returns:
         bool: 是否成功
     """
-    from pptx.util import Inches
+    return _run_in_session(pptx_file, output_file, 'compact')
+
+
+def check_linked_videos(pptx_file):
+    """
+    检查PPT中所有链接（未嵌入）的视频文件是否都能找到，放映前使用
     
+    Args:
+        pptx_file: PPTX文件路径
+    
+    Returns:
+        bool: 所有链接的文件都存在时为True
+    """
     if not os.path.exists(pptx_file):
         print(f"错误：找不到文件 {pptx_file}")
         return False
     
-    if not os.path.exists(video_path):
-        print(f"错误：找不到视频文件 {video_path}")
-        return False
-    
-    prs = Presentation(pptx_file)
-    
-    # 获取幻灯片尺寸
-    slide_width = prs.slide_width
-    slide_height = prs.slide_height
-    
-    # 添加一个空白幻灯片（使用空白布局）
-    blank_slide_layout = prs.slide_layouts[6]  # 6通常是空白布局
-    new_slide = prs.slides.add_slide(blank_slide_layout)
-    
-    # 添加全屏视频
-    # 视频位置：左上角(0,0)，尺寸：填满整个幻灯片
-    left = Inches(0)
-    top = Inches(0)
-    width = slide_width
-    height = slide_height
-    
-    # 插入视频
-    movie = new_slide.shapes.add_movie(
-        video_path,
-        left, top, width, height,
-        poster_frame_image=None,  # 不使用海报帧，使用视频第一帧
-        mime_type='video/mp4'
-    )
-    
-    # 如果指定了插入位置，则移动到该位置
-    if insert_position is not None:
-        if insert_position < 1 or insert_position > len(prs.slides):
-            print(f"错误：插入位置 {insert_position} 超出范围（共 {len(prs.slides)} 页）")
-            return False
-        
-        # 获取XML中的slides列表
-        xml_slides = prs.slides._sldIdLst
-        slides = list(xml_slides)
-        
-        # 移动新添加的幻灯片（最后一个）到指定位置
-        xml_slides.remove(slides[-1])
-        xml_slides.insert(insert_position - 1, slides[-1])
-    
-    # 保存
-    prs.save(output_file)
-    position_str = f"第 {insert_position} 页" if insert_position else "末尾"
-    print(f"已在 {position_str} 插入全屏视频幻灯片，文件已保存: {output_file}")
-    return True
+    links = pptx_reader.linked_media(pptx_file)
+    missing = [(slide_number, target, path) for slide_number, target, path, exists in links if not exists]
+    for slide_number, target, path in missing:
+        print(f"错误：第 {slide_number} 页链接的视频 {target} 找不到（{path}）")
+    print(f"共 {len(links)} 个链接，{len(missing)} 个找不到")
+    return not missing
 
 
 def set_pptx_page_texts(pptx_file, output_file, slide_number, replacements):
@@ -597,37 +437,10 @@ def set_pptx_page_texts(pptx_file, output_file, slide_number, replacements):
     Returns:
         bool: 是否成功
     """
-    if not os.path.exists(pptx_file):
-        print(f"错误：找不到文件 {pptx_file}")
-        return False
-    
-    prs = Presentation(pptx_file)
-    
-    # 检查页码是否有效
-    if slide_number < 1 or slide_number > len(prs.slides):
-        print(f"错误：页码 {slide_number} 超出范围（共 {len(prs.slides)} 页）")
-        return False
-    
-    # 获取指定页（索引从0开始）
-    slide = prs.slides[slide_number - 1]
-    
-    # 遍历该页的所有形状
-    for shape in slide.shapes:
-        if shape.has_text_frame:
-            for paragraph in shape.text_frame.paragraphs:
-                    for run in paragraph.runs:
-                        for origin_text, change_text in replacements.items():
-                            if origin_text in run.text:
-                                print(f"{run.text} → {change_text}", end="\n")
-                                run.text = run.text.replace(origin_text, change_text)
-    
-    # 保存
-    prs.save(output_file)
-    print(f"已修改第 {slide_number} 页，文件已保存: {output_file}")
-    return True
+    return _run_in_session(pptx_file, output_file, 'set_pptx_page_texts', slide_number, replacements)
 
 
-def set_pptx_page_texts_by_slides_shapes_index(pptx_file, output_file, slide_number, replacements):
+def set_pptx_page_texts_by_slides_shapes_index(pptx_file, output_file, slide_number, replacements, font_size=33):
     """
     修改指定页的文字内容
     
@@ -636,53 +449,67 @@ def set_pptx_page_texts_by_slides_shapes_index(pptx_file, output_file, slide_num
         output_file: 输出PPTX文件路径
         slide_number: 页码（从1开始）
         indexed_replacements: 字典，格式 {索引: '新文字'}
+        font_size: 被替换文字的字号（pt）
     
     Returns:
         bool: 是否成功
     """
-    if not os.path.exists(pptx_file):
-        print(f"错误：找不到文件 {pptx_file}")
-        return False
-    
-    prs = Presentation(pptx_file)
+    return _run_in_session(pptx_file, output_file, 'set_pptx_page_texts_by_slides_shapes_index', slide_number, replacements, font_size)
+
+
+def check_passages(passages, strict=False):
+    """
+    检查经文是否都获取成功，生成经文页之前调用，避免把空白经文写进PPT
+
+    Args:
+        passages: get_bibles.get_passages 返回的 Passage 列表
+        strict: 为True时范围内缺少任何一节也算失败（否则只警告，如译本本身省略的节）
+
+    Returns:
+        bool: 是否可以使用
+    """
+    ok = True
+    for passage in passages:
+        reference = f"{passage.book} {passage.chapter}:{passage.start_verse}-{passage.end_verse}"
+        missing = passage.missing()
+        if passage.error is not None:
+            print(f"错误：{reference} 获取失败 ({passage.error})")
+            ok = False
+        elif missing and strict:
+            print(f"错误：{reference} 缺少第 {missing} 节")
+            ok = False
+        elif missing:
+            print(f"警告：{reference} 缺少第 {missing} 节")
+    return ok
+
+
+def scripture_replacements(passage):
+    """
+    生成经文页的索引替换字典，供 set_pptx_page_texts_by_slides_shapes_index 使用
     
-    # 检查页码是否有效
-    if slide_number < 1 or slide_number > len(prs.slides):
-        print(f"错误：页码 {slide_number} 超出范围（共 {len(prs.slides)} 页）")
-        return False
+    Args:
+        passage: get_bibles.get_passages 返回的 Passage，按节号取经文
     
-    # 获取指定页（索引从0开始）
-    slide = prs.slides[slide_number - 1]
-    
-    for shape_index, run_replacements in replacements.items():
-        if not slide.shapes.__getitem__(shape_index).has_text_frame:
-            print(f"错误：形状索引 {shape_index} 不包含文本框")
-            return False
-        shape = slide.shapes[shape_index]
-        for paragraph_index in run_replacements.keys():
-            paragraph = shape.text_frame.paragraphs[paragraph_index] 
-            new_texts_index = run_replacements[paragraph_index]
-            print(f"Shape {shape_index} paragraph {paragraph_index}")
-            for run_index, new_text in new_texts_index.items():
-                if run_index < len(paragraph.runs):
-                    print(f" original text {paragraph.runs[run_index].text} new text: {new_text}")
-                    paragraph.runs[run_index].text = new_text
-                    paragraph.runs[run_index].font.bold = True
-                    paragraph.runs[run_index].font.size = Pt(33)
-                else:
-                    print(f" append new text on {run_index}: {new_text}")
-                    new_run = paragraph.add_run()
-                    new_run.text = " " + new_text
-                    # 新增行时，字体加粗、字号30pt，字体固定为STXingkai
-                    new_run.font.bold = True
-                    new_run.font.size = Pt(20)
-                    new_run.font.name = "STXingkai"
-    
-    
-    # 保存
-    prs.save(output_file)
-    print(f"已修改第 {slide_number} 页，文件已保存: {output_file}")
-    return True
+    Returns:
+        dict: 格式 {形状索引: {段落索引: {run索引: '新文字'}}}
+    """
+    start_verse, end_verse = passage.start_verse, passage.end_verse
+
+    def line(offset):
+        # 前3行总是显示节号，之后只在范围内显示
+        verse = start_verse + offset
+        number = str(verse) if offset < 3 or verse <= end_verse else ""
+        return {0: number, 1: passage.text(verse)}
+
+    replacements = {
+        1: {0: {1: passage.book, 2: f" {passage.chapter}: {start_verse}-{end_verse}"}},
+        2: {offset: line(offset) for offset in range(6)}
+    }
+    # 超过6节时，多出的经文追加到第5段
+    if end_verse - start_verse >= 6:
+        for j in range(5, end_verse - start_verse + 1):
+            replacements[2][4][1] += f" \n{start_verse + j}" + passage.text(start_verse + j)
+    return replacements
 
 if __name__ == "__main__":
     # 示例1：读取PPT信息
@@ -730,9 +557,9 @@ if __name__ == "__main__":
     #delete_slides(output_file, output_file, pages_music)
 
     
-    for i in range(0, len(pages_music)):
-        video_file = f"{repository_music}\\{4}.mp4"  # 修改为实际视频文件路径
-        #insert_fullscreen_video_slide(output_file, output_file, video_file, insert_position=pages_music[i])
+    # 所有诗歌视频一次插入：页码为插入后的最终页码
+    videos = [(page, f"{repository_music}\\{4}.mp4") for page in pages_music]  # 修改为实际视频文件路径
+    #insert_video_slides(output_file, output_file, videos)
   
     # ========== 经文页面（新方法）==========
     # 使用新函数设置经文页面
@@ -743,37 +570,18 @@ if __name__ == "__main__":
     #duplicate_slide(output_file, output_file, 12)  # 复制第一页经文页作为模板
     page_to_modify = 13
     #show_structure_one_page(output_file, page_to_modify)
-    texts = [
-        #["路加福音", 9, 1, 6, get_bibles.get_bible_verses("路加福音", 9, 1, 6)],
-        #["路加福音", 9, 7, 11, get_bibles.get_bible_verses("路加福音", 9, 7, 11)],
-        ["路加福音", 9, 12, 17, get_bibles.get_bible_verses("路加福音", 9, 12, 17)],
-        #["路加福音", 9, 18, 22, get_bibles.get_bible_verses("路加福音", 9, 18, 22)],
-        #["路加福音", 9, 23, 27, get_bibles.get_bible_verses("路加福音", 9, 23, 27)]
+    references = [
+        #("路加福音", 9, 1, 6),
+        #("路加福音", 9, 7, 11),
+        ("路加福音", 9, 12, 17),
+        #("路加福音", 9, 18, 22),
+        #("路加福音", 9, 23, 27),
     ]
-    count = 0
-    for text in texts:
-        count += 1
-        i = text[2]
-        bibles = text[4]
-        replacements = {
-            1: {0: {1: text[0], 2: f" {text[1]}: {text[2]}-{text[3]}"}},
-            2: {
-                0: {0: str(i), 1: bibles[0] if len(bibles) > 0 else ""},
-                1: {0: str(i + 1), 1: bibles[1] if len(bibles) > 1 else ""},
-                2: {0: str(i + 2), 1: bibles[2] if len(bibles) > 2 else ""},
-                3: {0: str(i + 3) if len(bibles) > 3 else "", 1: bibles[3] if len(bibles) > 3 else ""},
-                4: {0: str(i + 4) if len(bibles) > 4 else "", 1: bibles[4] if len(bibles) > 4 else ""},
-                5: {0: str(i + 5) if len(bibles) > 5 else "", 1: bibles[5] if len(bibles) > 5 else ""}
-            }
-        }
-        if text[3] - text[2] >= 6:
-            for j in range(5, text[3] - text[2] + 1):
-                replacements[2][4][1] += f" \n{str(i + j)}" + (bibles[j] if len(bibles) > j else "")
-
-        '''
-        set_pptx_page_texts_by_slides_shapes_index(output_file, output_file, page_to_modify, replacements)
-        if count < len(texts):
-            duplicate_slide(output_file, output_file, page_to_modify)
-        page_to_modify += 1
-        '''
+    # 所有经文并发获取，只需约一次网络往返
+    texts = get_bibles.get_passages(references)
+    if not check_passages(texts):
+        sys.exit(1)
+    # 每段经文一页，全部由模板页一次生成
+    fills = [scripture_replacements(text) for text in texts]
+    #clone_slide(output_file, output_file, page_to_modify, fills)
     swap_slides(output_file, output_file, 12, 13)
@@ -1,9 +1,86 @@
-import requests
-from urllib.parse import quote
-from zhconv import convert
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import bible_store
+from bible_client import client
+from verse_cache import VerseCache, ChapterCache
 
 # https://bible-api.com/%E8%B7%AF%E5%8A%A0%E7%A6%8F%E9%9F%B3+1:27?translation=cuv
 
+# 联网获取的经文缓存在磁盘上，重复运行脚本时不再请求；可替换为 VerseCache(ttl=...) 等配置
+verse_cache = VerseCache()
+# 本次运行中已获取的经文按章保存在内存中，同一章的任意子范围直接返回
+chapter_cache = ChapterCache()
+
+# 需要转换为简体中文的译本；其他译本（如法语 lsf）原样返回
+CHINESE_TRANSLATIONS = {'cuv'}
+# 已转换经文的LRU缓存：原文 -> 简体
+_CONVERT_MEMO_SIZE = 4096
+_convert_memo = OrderedDict()
+_convert_lock = threading.Lock()
+
+
+class Verse:
+    """一节经文"""
+    __slots__ = ('book', 'chapter', 'verse', 'text', 'translation')
+
+    def __init__(self, book, chapter, verse, text, translation):
+        self.book = book
+        self.chapter = chapter
+        self.verse = verse
+        self.text = text
+        self.translation = translation
+
+    def __repr__(self):
+        return f"Verse({self.book} {self.chapter}:{self.verse} {self.translation} {self.text!r})"
+
+
+class Passage:
+    """
+    一段经文（如 路加福音 9:12-17），按节号访问，不需要由起始节推算
+
+    Example:
+        passage = get_passages([("路加福音", 9, 12, 17)])[0]
+        passage.text(13)      # 第13节经文，没有该节时返回 ""
+        passage.missing()     # 请求范围内API没有返回的节号
+    """
+    __slots__ = ('book', 'chapter', 'start_verse', 'end_verse', 'translation', 'verses', 'error', '_by_number')
+
+    def __init__(self, book, chapter, start_verse, end_verse, translation, verses=(), error=None):
+        self.book = book
+        self.chapter = chapter
+        self.start_verse = start_verse
+        self.end_verse = end_verse
+        self.translation = translation
+        self.verses = tuple(verses)
+        self.error = error
+        self._by_number = {verse.verse: verse for verse in self.verses}
+
+    def __repr__(self):
+        return f"Passage({self.book} {self.chapter}:{self.start_verse}-{self.end_verse} {self.translation}, {len(self.verses)} 节)"
+
+    def __len__(self):
+        return len(self.verses)
+
+    def __iter__(self):
+        return iter(self.verses)
+
+    def text(self, verse_number):
+        """返回指定节号的经文，没有该节时返回空字符串"""
+        verse = self._by_number.get(verse_number)
+        return verse.text if verse is not None else ""
+
+    def missing(self):
+        """返回请求范围内缺少的节号列表（获取失败时为整个范围）"""
+        return [n for n in range(self.start_verse, self.end_verse + 1) if n not in self._by_number]
+
+    def texts(self):
+        """返回经文列表（get_bible_verses 的旧格式），获取失败时为错误信息"""
+        if self.error is not None:
+            return [f"错误: 无法获取数据 ({self.error})"]
+        return [verse.text for verse in self.verses]
+
+
 def get_bible_verses(book_name, chapter, start_verse, end_verse, French=False):
     """
     获取指定章节和范围的简体中文经文
@@ -13,25 +90,128 @@ def get_bible_verses(book_name, chapter, start_verse, end_verse, French=False):
     :param end_verse: 结束节
     :return: 经文列表
     """
-    # 使用 Bible-api，指定版本为 cuv (和合本简体)
-    # 格式：https://bible-api.com/book+chapter:start-end?translation=cuv
-    # 对中文书名进行 URL 编码
-    encoded_book = quote(book_name)
-    url = f"https://bible-api.com/{encoded_book}+{chapter}:{start_verse}-{end_verse}?translation=cuv"
-    if French:
-        url = f"https://bible-api.com/{encoded_book}+{chapter}:{start_verse}-{end_verse}?translation=lsf"  # 法语版本
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status() # 检查请求是否成功
-        data = response.json()
-        
-        # 提取每一节的内容并存入列表
-        verses_list = [convert(verse['text'].strip(), 'zh-cn') for verse in data['verses']]
-        return verses_list
+    translation = 'lsf' if French else 'cuv'  # cuv 和合本 / lsf 法语版本
+    return get_bible_passages([(book_name, chapter, start_verse, end_verse, translation)])[0]
+
+
+def get_bible_passages(references, max_workers=5):
+    """
+    并发获取多段经文，结果顺序与输入一致
+    :param references: 经文列表，每项为 (卷名, 章, 起始节, 结束节, 译本)，译本可省略（默认 cuv）
+    :param max_workers: 最多同时进行的请求数
+    :return: 与 references 一一对应的经文列表的列表
+    """
+    return [passage.texts() for passage in get_passages(references, max_workers)]
+
+
+def get_passages(references, max_workers=5):
+    """
+    并发获取多段经文，返回带节号的 Passage，结果顺序与输入一致
+    同一章中需要联网的各段经文合并为一次请求（如 9:1-6、9:7-11、9:12-17 只请求 9:1-17）
+    :param references: 经文列表，每项为 (卷名, 章, 起始节, 结束节, 译本)，译本可省略（默认 cuv）
+    :param max_workers: 最多同时进行的请求数
+    :return: 与 references 一一对应的 Passage 列表
+    """
+    references = [tuple(reference) + ('cuv',) * (5 - len(reference)) for reference in references]
+    results = [_lookup(*reference) for reference in references]
+
+    # 需要联网的经文按章合并：每章只请求一次，覆盖该章所有需要的节
+    spans = {}
+    for reference, verses in zip(references, results):
+        if verses is None:
+            book_name, chapter, start_verse, end_verse, translation = reference
+            key = (book_name, chapter, translation)
+            span = spans.get(key, (start_verse, end_verse))
+            spans[key] = (min(span[0], start_verse), max(span[1], end_verse))
+
+    errors = {}
+    if spans:
+        fetches = [(book_name, chapter, span[0], span[1], translation)
+                   for (book_name, chapter, translation), span in spans.items()]
+        if len(fetches) == 1:
+            outcomes = [_fetch(*fetches[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(fetches))) as executor:
+                outcomes = list(executor.map(lambda fetch: _fetch(*fetch), fetches))
+        failed = {(fetch[0], fetch[1], fetch[4]): error for fetch, error in zip(fetches, outcomes) if error}
+
+        for n, (reference, verses) in enumerate(zip(references, results)):
+            if verses is None:
+                book_name, chapter, start_verse, end_verse, translation = reference
+                error = failed.get((book_name, chapter, translation))
+                if error:
+                    errors[n] = error
+                    continue
+                results[n] = chapter_cache.get(translation, book_name, chapter, start_verse, end_verse)
+                verse_cache.put(translation, book_name, chapter, start_verse, end_verse, results[n])
+
+    passages = []
+    for n, (reference, verses) in enumerate(zip(references, results)):
+        book_name, chapter, start_verse, end_verse, translation = reference
+        if n in errors:
+            passages.append(Passage(book_name, chapter, start_verse, end_verse, translation, error=errors[n]))
+            continue
+        texts = _convert([text for _, text in verses], translation)
+        passages.append(Passage(book_name, chapter, start_verse, end_verse, translation, [
+            Verse(book_name, chapter, verse_number, text, translation)
+            for (verse_number, _), text in zip(verses, texts)
+        ]))
+    return passages
+
 
+def _lookup(book_name, chapter, start_verse, end_verse, translation):
+    """不联网查找一段经文：本地经文库 -> 内存按章缓存 -> 磁盘缓存；返回 [(节号, 经文), ...]，都没有时返回None"""
+    verses = bible_store.get_verses(translation, book_name, chapter, start_verse, end_verse)
+    if verses is None:
+        verses = chapter_cache.get(translation, book_name, chapter, start_verse, end_verse)
+    if verses is None:
+        verses = verse_cache.get(translation, book_name, chapter, start_verse, end_verse)
+    return verses
+
+
+def _fetch(book_name, chapter, start_verse, end_verse, translation):
+    """联网获取一段经文并存入内存按章缓存；成功时返回None，失败时返回异常"""
+    # 使用 Bible-api，格式：https://bible-api.com/book+chapter:start-end?translation=cuv
+    # 通过共享客户端请求：复用连接、有超时，429/5xx 时自动重试
+    try:
+        records = client.fetch_verses(book_name, chapter, start_verse, end_verse, translation)
     except Exception as e:
-        return [f"错误: 无法获取数据 ({e})"]
+        return e
+    chapter_cache.add(translation, book_name, chapter, start_verse, end_verse,
+                      {record['verse']: record['text'] for record in records if record['chapter'] == chapter})
+    return None
+
+
+def _convert(texts, translation):
+    """
+    去掉首尾空白；中文译本整段一次转换为简体，已转换过的经文直接取缓存
+    zhconv 在第一次需要转换时才导入，只用法语译本时不会加载它的词典
+    """
+    texts = [text.strip() for text in texts]
+    if translation not in CHINESE_TRANSLATIONS:
+        return texts
+
+    with _convert_lock:
+        converted = {text: _convert_memo[text] for text in texts if text in _convert_memo}
+        for text in converted:
+            _convert_memo.move_to_end(text)
+
+    misses = [text for text in dict.fromkeys(texts) if text not in converted]
+    if misses:
+        from zhconv import convert
+        results = convert('\n'.join(misses), 'zh-cn').split('\n')
+        if len(results) != len(misses):
+            # 经文本身含有换行时无法按行拆分，逐节转换
+            results = [convert(text, 'zh-cn') for text in misses]
+        converted.update(zip(misses, results))
+        with _convert_lock:
+            for text, result in zip(misses, results):
+                _convert_memo[text] = result
+            while len(_convert_memo) > _CONVERT_MEMO_SIZE:
+                _convert_memo.popitem(last=False)
+
+    return [converted[text] for text in texts]
+
 
 # --- 使用示例 ---
 # 常见的英文对应：路加福音 -> Luke, 创世记 -> Genesis, 马太福音 -> Matthew
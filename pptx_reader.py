@@ -0,0 +1,380 @@
+import json
+import os
+import posixpath
+import sys
+import urllib.parse
+import urllib.request
+import zipfile
+from lxml import etree
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+# 只读方式读取PPTX：直接打开zip包，按需解析单个幻灯片的XML，
+# 不构建 python-pptx 的 Presentation（它会把整个包包括视频都读入内存）。
+# 结果用紧凑的 SlideInfo / ShapeInfo 对象表示，可转换为 read_pptx 原来的字典格式或JSON。
+
+_P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+_R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+_MEDIA_RELTYPES = {
+    'http://schemas.openxmlformats.org/officeDocument/2006/relationships/video',
+    'http://schemas.openxmlformats.org/officeDocument/2006/relationships/audio',
+    'http://schemas.microsoft.com/office/2007/relationships/media',
+}
+
+_SHAPE_TAGS = {_P + 'sp', _P + 'grpSp', _P + 'graphicFrame', _P + 'cxnSp', _P + 'pic', _P + 'contentPart'}
+
+_GRAPHIC_DATA_TYPES = {
+    'http://schemas.openxmlformats.org/drawingml/2006/chart': MSO_SHAPE_TYPE.CHART,
+    'http://schemas.openxmlformats.org/drawingml/2006/table': MSO_SHAPE_TYPE.TABLE,
+}
+_OLE_URI = 'http://schemas.openxmlformats.org/presentationml/2006/ole'
+
+# 形状类型名称只生成一次，所有形状共用同一个字符串
+_TYPE_NAMES = {None: sys.intern('None')}
+
+
+def type_name(shape_type):
+    """与 str(shape.shape_type) 相同的名称，如 MSO_SHAPE_TYPE.PLACEHOLDER"""
+    name = _TYPE_NAMES.get(shape_type)
+    if name is None:
+        name = _TYPE_NAMES[shape_type] = sys.intern(str(shape_type))
+    return name
+
+
+class ShapeInfo:
+    """
+    一个形状的信息
+
+    shape_type 保留 MSO_SHAPE_TYPE 枚举值（无法识别时为None），type 为其名称。
+    也可以像原来的字典一样用 shape_info['text'] 访问。
+    """
+    __slots__ = ('shape_number', 'shape_type', 'has_text', 'text')
+
+    def __init__(self, shape_number, shape_type, has_text, text=''):
+        self.shape_number = shape_number
+        self.shape_type = shape_type
+        self.has_text = has_text
+        self.text = text
+
+    @property
+    def type(self):
+        return type_name(self.shape_type)
+
+    def __getitem__(self, key):
+        if key not in ('shape_number', 'type', 'has_text', 'text'):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self):
+        """转换为 read_pptx 原来的字典格式"""
+        return {
+            'shape_number': self.shape_number,
+            'type': self.type,
+            'has_text': self.has_text,
+            'text': self.text
+        }
+
+    @classmethod
+    def from_dict(cls, shape_info):
+        type_text = shape_info['type']
+        shape_type = None
+        if type_text != 'None':
+            shape_type = MSO_SHAPE_TYPE(int(type_text[type_text.rindex('(') + 1:-1]))
+        return cls(shape_info['shape_number'], shape_type, shape_info['has_text'], shape_info['text'])
+
+
+class SlideInfo:
+    """一页的信息；shapes 为 ShapeInfo 元组"""
+    __slots__ = ('slide_number', 'title', 'shapes')
+
+    def __init__(self, slide_number, title, shapes):
+        self.slide_number = slide_number
+        self.title = title
+        self.shapes = tuple(shapes)
+
+    def __getitem__(self, key):
+        if key not in ('slide_number', 'title', 'shapes'):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {
+            'slide_number': self.slide_number,
+            'title': self.title,
+            'shapes': [shape.to_dict() for shape in self.shapes]
+        }
+
+    @classmethod
+    def from_dict(cls, slide_info):
+        return cls(slide_info['slide_number'], slide_info['title'],
+                   [ShapeInfo.from_dict(shape) for shape in slide_info['shapes']])
+
+
+class DeckInfo:
+    """
+    整个PPT的信息（read_pptx 的返回值）
+
+    Example:
+        info = read_pptx('input.pptx')
+        info.slides[0].shapes[1].text
+        info['slide_count']          # 原来的字典写法仍然可用
+        info.to_json()               # 原来的字典格式，JSON字符串
+    """
+    __slots__ = ('slide_count', 'slides')
+
+    def __init__(self, slides):
+        self.slides = list(slides)
+        self.slide_count = len(self.slides)
+
+    def __getitem__(self, key):
+        if key not in ('slide_count', 'slides'):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {
+            'slide_count': self.slide_count,
+            'slides': [slide.to_dict() for slide in self.slides]
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+    @classmethod
+    def from_dict(cls, ppt_info):
+        """由 read_pptx 原来的字典格式（如 json.loads 读回的结果）创建"""
+        if isinstance(ppt_info, cls):
+            return ppt_info
+        return cls(SlideInfo.from_dict(slide) for slide in ppt_info['slides'])
+
+
+def _rels_name(part_name):
+    """ppt/presentation.xml -> ppt/_rels/presentation.xml.rels"""
+    directory, filename = posixpath.split(part_name)
+    return posixpath.join(directory, '_rels', filename + '.rels')
+
+
+def _read_rels(zf, part_name):
+    """读取部件的关系：{rId: (关系类型, 目标部件名)}"""
+    rels = {}
+    root = etree.fromstring(zf.read(_rels_name(part_name)))
+    base = posixpath.dirname(part_name)
+    for rel in root.iter(_REL + 'Relationship'):
+        target = rel.get('Target')
+        if rel.get('TargetMode') != 'External':
+            target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(base, target))
+        rels[rel.get('Id')] = (rel.get('Type'), target)
+    return rels
+
+
+def slide_part_names(zf):
+    """
+    按放映顺序返回所有幻灯片在zip中的部件名，只读取 presentation.xml 及其关系
+
+    Args:
+        zf: 已打开的 zipfile.ZipFile
+
+    Returns:
+        list: 如 ['ppt/slides/slide1.xml', 'ppt/slides/slide3.xml', ...]
+    """
+    package_rels = _read_rels(zf, '')
+    presentation = next(target for reltype, target in package_rels.values() if reltype == _OFFICE_DOCUMENT)
+    rels = _read_rels(zf, presentation)
+    root = etree.fromstring(zf.read(presentation))
+    return [rels[sldId.get(_R + 'id')][1] for sldId in root.iter(_P + 'sldId')]
+
+
+def slide_count(pptx_file):
+    """返回总页数，只读取 presentation.xml"""
+    with zipfile.ZipFile(pptx_file) as zf:
+        return len(slide_part_names(zf))
+
+
+def _shape_type(elm):
+    """与 shape.shape_type 相同的 MSO_SHAPE_TYPE 值，无法识别时为None"""
+    tag = elm.tag
+    if tag in (_P + 'sp', _P + 'pic', _P + 'graphicFrame') and elm.find(f'./*/{_P}nvPr/{_P}ph') is not None:
+        return MSO_SHAPE_TYPE.PLACEHOLDER
+    if tag == _P + 'sp':
+        if elm.find(f'./{_P}spPr/{_A}custGeom') is not None:
+            return MSO_SHAPE_TYPE.FREEFORM
+        is_textbox = elm.find(f'./{_P}nvSpPr/{_P}cNvSpPr').get('txBox') in ('1', 'true')
+        if elm.find(f'./{_P}spPr/{_A}prstGeom') is not None and not is_textbox:
+            return MSO_SHAPE_TYPE.AUTO_SHAPE
+        return MSO_SHAPE_TYPE.TEXT_BOX if is_textbox else None
+    if tag == _P + 'pic':
+        return MSO_SHAPE_TYPE.MEDIA if elm.find(f'./{_P}nvPicPr/{_P}nvPr/{_A}videoFile') is not None else MSO_SHAPE_TYPE.PICTURE
+    if tag == _P + 'graphicFrame':
+        graphic_data = elm.find(f'./{_A}graphic/{_A}graphicData')
+        uri = graphic_data.get('uri') if graphic_data is not None else None
+        if uri == _OLE_URI:
+            embedded = graphic_data.find(f'.//{_P}oleObj/{_P}embed') is not None
+            return MSO_SHAPE_TYPE.EMBEDDED_OLE_OBJECT if embedded else MSO_SHAPE_TYPE.LINKED_OLE_OBJECT
+        return _GRAPHIC_DATA_TYPES.get(uri)
+    if tag == _P + 'grpSp':
+        return MSO_SHAPE_TYPE.GROUP
+    if tag == _P + 'cxnSp':
+        return MSO_SHAPE_TYPE.LINE
+    return None
+
+
+def _paragraph_text(p):
+    """段落文字，与 python-pptx 的 paragraph.text 相同（换行为 \\v）"""
+    parts = []
+    for child in p:
+        if child.tag in (_A + 'r', _A + 'fld'):
+            t = child.find(_A + 't')
+            parts.append(t.text or '' if t is not None else '')
+        elif child.tag == _A + 'br':
+            parts.append('\v')
+    return ''.join(parts)
+
+
+def _iter_shape_elements(source):
+    """
+    流式解析一页的XML（iterparse），依次产生 spTree 下的每个顶层形状元素
+
+    调用者处理完一个形状后它就被清空并从树中移除，内存中同时只保留一个形状；
+    spTree 结束后不再解析页面剩余部分。
+    """
+    for event, elm in etree.iterparse(source, events=('end',)):
+        if elm.tag == _P + 'spTree':
+            return
+        parent = elm.getparent()
+        if elm.tag in _SHAPE_TAGS and parent.tag == _P + 'spTree':
+            yield elm
+            elm.clear()
+            while elm.getprevious() is not None:
+                del parent[0]
+
+
+def _slide_record(slide_number, source):
+    """流式解析一页，转换为 SlideInfo"""
+    title = None
+    shape_infos = []
+    for shape_num, elm in enumerate(_iter_shape_elements(source)):
+        # 标题：第一个 idx 为0的占位符
+        if title is None:
+            ph = elm.find(f'./*/{_P}nvPr/{_P}ph')
+            if ph is not None and int(ph.get('idx', '0')) == 0:
+                title = '\n'.join(_paragraph_text(p) for p in elm.iterfind(f'./{_P}txBody/{_A}p'))
+
+        has_text = elm.tag == _P + 'sp'
+        text = ''
+        if has_text:
+            text = ''.join(t.text or '' for t in elm.iterfind(f'./{_P}txBody/{_A}p/{_A}r/{_A}t'))
+        shape_infos.append(ShapeInfo(shape_num, _shape_type(elm), has_text, text))
+    return SlideInfo(slide_number, title or '', shape_infos)
+
+
+def iter_slides(pptx_file):
+    """
+    逐页读取PPT，每次只解析一页；调用者提前停止迭代时不会再读取后面的页
+
+    Args:
+        pptx_file: PPTX文件路径
+
+    Yields:
+        SlideInfo: 与 read_pptx 返回的 slides 中每一项相同
+    """
+    with zipfile.ZipFile(pptx_file) as zf:
+        for slide_number, name in enumerate(slide_part_names(zf), 1):
+            with zf.open(name) as source:
+                yield _slide_record(slide_number, source)
+
+
+def read_deck(pptx_file):
+    """
+    读取整个PPT，结果与 read_pptx 相同，但不构建 python-pptx 对象
+
+    Returns:
+        DeckInfo
+    """
+    return DeckInfo(iter_slides(pptx_file))
+
+
+def read_slide(pptx_file, slide_number):
+    """
+    只读取指定页
+
+    Args:
+        pptx_file: PPTX文件路径
+        slide_number: 页码（从1开始）
+
+    Returns:
+        tuple: (总页数, 该页的 SlideInfo)；页码超出范围时为None
+    """
+    with zipfile.ZipFile(pptx_file) as zf:
+        names = slide_part_names(zf)
+        if slide_number < 1 or slide_number > len(names):
+            return len(names), None
+        with zf.open(names[slide_number - 1]) as source:
+            return len(names), _slide_record(slide_number, source)
+
+
+def read_structure(pptx_file, slide_number):
+    """
+    读取指定页的 形状/段落/run 结构，索引与 python-pptx 的 shapes / paragraphs / runs 相同
+
+    Args:
+        pptx_file: PPTX文件路径
+        slide_number: 页码（从1开始）
+
+    Returns:
+        tuple: (总页数, 结构)；结构为每个形状一项：有文本框时为 [[run文字, ...], ...]（每段一个列表），
+               否则为None；页码超出范围时结构为None
+    """
+    with zipfile.ZipFile(pptx_file) as zf:
+        names = slide_part_names(zf)
+        if slide_number < 1 or slide_number > len(names):
+            return len(names), None
+        structure = []
+        with zf.open(names[slide_number - 1]) as source:
+            for elm in _iter_shape_elements(source):
+                if elm.tag != _P + 'sp':
+                    structure.append(None)
+                    continue
+                # 没有 txBody 的形状，python-pptx 访问 text_frame 时会补上一个空段落
+                paragraphs = [[r.findtext(_A + 't', '') for r in p.iterfind(_A + 'r')]
+                              for p in elm.iterfind(f'./{_P}txBody/{_A}p')]
+                structure.append(paragraphs if elm.find(_P + 'txBody') is not None else [[]])
+        return len(names), structure
+
+
+def _resolve_link(target, base_dir):
+    """外部链接地址 -> 本地文件路径（相对路径相对于PPT所在目录）"""
+    if target.startswith('file:'):
+        return urllib.request.url2pathname(urllib.parse.urlparse(target).path)
+    path = os.path.join(base_dir, target)
+    if not os.path.exists(path):
+        path = os.path.join(base_dir, urllib.parse.unquote(target))
+    return os.path.normpath(path)
+
+
+def linked_media(pptx_file):
+    """
+    列出所有链接（未嵌入）的视频、音频
+
+    Args:
+        pptx_file: PPTX文件路径
+
+    Returns:
+        list: [(页码, 链接地址, 本地路径, 文件是否存在), ...]，每页每个地址一项
+    """
+    base_dir = os.path.dirname(os.path.abspath(pptx_file))
+    links = []
+    with zipfile.ZipFile(pptx_file) as zf:
+        for slide_number, name in enumerate(slide_part_names(zf), 1):
+            targets = []
+            root = etree.fromstring(zf.read(_rels_name(name)))
+            for rel in root.iter(_REL + 'Relationship'):
+                target = rel.get('Target')
+                if (rel.get('TargetMode') == 'External' and rel.get('Type') in _MEDIA_RELTYPES
+                        and target not in targets):
+                    targets.append(target)
+            for target in targets:
+                path = _resolve_link(target, base_dir)
+                links.append((slide_number, target, path, os.path.isfile(path)))
+    return links
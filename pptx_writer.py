@@ -0,0 +1,300 @@
+import os
+import struct
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from deck_media import StreamedMediaPart
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import XmlPart
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.serialized import _ContentTypesItem
+
+# 增量保存PPT：只重新压缩内容有变化的部件，未变化的部件（尤其是之前插入的视频、图片）
+# 直接从原文件复制已压缩的字节，保存时间取决于修改了多少，而不是文件有多大。
+# 写入的成员及顺序与 python-pptx 的 prs.save 相同。
+# StreamedMediaPart（新插入的视频）从源文件分块读取、压缩后写入，不整体读入内存。
+
+_COPY_CHUNK = 1024 * 1024
+_PARALLEL_BLOCK = 4 * 1024 * 1024
+_MASK_USE_DATA_DESCRIPTOR = 0x08
+# 通用标志位 1-2：deflate 使用的压缩级别（ZIP规范：01 最大压缩，10 快速压缩）
+_MASK_DEFLATE_LEVEL = 0x06
+_DEFLATE_MAXIMUM = 0x02
+_DEFLATE_FAST = 0x04
+
+# 压缩方案：
+#   draft   —— 编辑过程中的中间保存，快速压缩（级别1）
+#   default —— 与 prs.save 相同（级别6）
+#   final   —— 最终文件，最大压缩（级别9），各部件（大部件分块）在线程池中并行压缩；
+#              原文件中没有以最大压缩保存的成员也会重新压缩
+PROFILES = {
+    'draft': {'level': 1, 'workers': 1},
+    'default': {'level': 6, 'workers': 1},
+    'final': {'level': 9, 'workers': os.cpu_count() or 1},
+}
+
+
+def _members(prs):
+    """
+    按 prs.save 的顺序产生要写入的 (成员名, 数据, 是否XML)
+
+    StreamedMediaPart 的数据不读出，直接产生部件本身。
+    """
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+    yield CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts)), True
+    yield PACKAGE_URI.rels_uri.membername, package._rels.xml, True
+    for part in parts:
+        if isinstance(part, StreamedMediaPart):
+            yield part.partname.membername, part, False
+        else:
+            yield part.partname.membername, part.blob, isinstance(part, XmlPart)
+        if part._rels:
+            yield part.partname.rels_uri.membername, part.rels.xml, True
+
+
+def _unchanged(source, info, blob, is_xml):
+    """
+    成员内容是否与原文件中同名成员相同
+
+    先比较大小和CRC（不需要解压）；XML部件较小，再逐字节确认，
+    二进制部件（媒体、图片）是打开时读入的原始字节，大小和CRC相同即可。
+    """
+    if info is None or info.file_size != len(blob) or info.CRC != zlib.crc32(blob):
+        return False
+    return not is_xml or source.read(info) == blob
+
+
+def _level_flags(level):
+    """压缩级别对应的通用标志位"""
+    if level >= 8:
+        return _DEFLATE_MAXIMUM
+    if level <= 2:
+        return _DEFLATE_FAST
+    return 0
+
+
+def _reusable(info, level):
+    """原文件中的压缩数据是否满足当前压缩方案（最大压缩时要求原成员也是最大压缩）"""
+    if level < 8:
+        return True
+    return (info.compress_type == zipfile.ZIP_DEFLATED
+            and info.flag_bits & _MASK_DEFLATE_LEVEL == _DEFLATE_MAXIMUM)
+
+
+def _compress(blob, level):
+    """压缩一个成员（zlib 压缩时释放GIL，多个成员可以在线程池中同时压缩）"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(blob) + compressor.flush()
+
+
+def _compress_block(block, level, last):
+    """
+    独立压缩大成员中的一块；除最后一块外以 Z_SYNC_FLUSH 结束（字节对齐、不是最终块），
+    各块的压缩数据按顺序拼接后就是一个完整的 deflate 流
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _submit(executor, blob, level):
+    """提交压缩任务；大成员（如视频）分块，使一个成员也能用上多个线程"""
+    if len(blob) <= _PARALLEL_BLOCK:
+        return [executor.submit(_compress, blob, level)]
+    view = memoryview(blob)
+    starts = range(0, len(blob), _PARALLEL_BLOCK)
+    return [executor.submit(_compress_block, view[start:start + _PARALLEL_BLOCK], level,
+                            start + _PARALLEL_BLOCK >= len(blob))
+            for start in starts]
+
+
+def _check_new_member(target, name):
+    """
+    成员不能重名（zipfile.writestr 只警告，这里直接写入 filelist 会跳过它的检查）；
+    重名说明包中有两个部件名相同，生成的文件会损坏
+    """
+    if name in target.NameToInfo:
+        raise ValueError(f"PPT中有重名的部件 {name}，未保存")
+
+
+def _append(target, zinfo, chunks):
+    """在 target 末尾写入一个成员：本地文件头 + 已压缩的数据块"""
+    _check_new_member(target, zinfo.filename)
+    zinfo.flag_bits &= ~_MASK_USE_DATA_DESCRIPTOR
+    target.fp.seek(target.start_dir)
+    zinfo.header_offset = target.fp.tell()
+    target.fp.write(zinfo.FileHeader())
+    for chunk in chunks:
+        target.fp.write(chunk)
+    target.filelist.append(zinfo)
+    target.NameToInfo[zinfo.filename] = zinfo
+    target.start_dir = target.fp.tell()
+
+
+def _write_stream(target, name, part, level, executor):
+    """
+    分块读取 StreamedMediaPart 的源文件，边压缩边写入 target
+
+    CRC和压缩后的大小写完数据才知道：先写文件头，最后回到文件头处重写。
+    并行压缩时最多同时保留 2×线程数 个块，内存占用与视频大小无关。
+    """
+    _check_new_member(target, name)
+    zinfo = zipfile.ZipInfo(name, time.localtime()[:6])
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.flag_bits = _level_flags(level)
+    zinfo.external_attr = 0o600 << 16
+    zinfo.file_size = part.size
+    zinfo.CRC = 0
+    zinfo.compress_size = 0
+    zip64 = part.size * 1.05 > zipfile.ZIP64_LIMIT
+
+    target.fp.seek(target.start_dir)
+    zinfo.header_offset = target.fp.tell()
+    target.fp.write(zinfo.FileHeader(zip64))
+
+    crc = 0
+    compress_size = 0
+    with part.open() as f:
+        if executor is None:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+            for block in iter(lambda: f.read(_COPY_CHUNK), b''):
+                crc = zlib.crc32(block, crc)
+                data = compressor.compress(block)
+                target.fp.write(data)
+                compress_size += len(data)
+            data = compressor.flush()
+            target.fp.write(data)
+            compress_size += len(data)
+        else:
+            pending = deque()
+            window = 2 * executor._max_workers
+            block = f.read(_PARALLEL_BLOCK)
+            while True:
+                next_block = f.read(_PARALLEL_BLOCK) if block else b''
+                crc = zlib.crc32(block, crc)
+                pending.append(executor.submit(_compress_block, block, level, not next_block))
+                while pending and (len(pending) >= window or not next_block):
+                    data = pending.popleft().result()
+                    target.fp.write(data)
+                    compress_size += len(data)
+                if not next_block:
+                    break
+                block = next_block
+
+    zinfo.CRC = crc
+    zinfo.compress_size = compress_size
+    target.start_dir = target.fp.tell()
+    target.fp.seek(zinfo.header_offset)
+    target.fp.write(zinfo.FileHeader(zip64))
+    target.fp.seek(target.start_dir)
+    target.filelist.append(zinfo)
+    target.NameToInfo[zinfo.filename] = zinfo
+
+
+def _write_compressed(target, name, blob, data, level):
+    """把压缩好的数据写入 target"""
+    zinfo = zipfile.ZipInfo(name, time.localtime()[:6])
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.flag_bits = _level_flags(level)
+    zinfo.external_attr = 0o600 << 16
+    zinfo.CRC = zlib.crc32(blob)
+    zinfo.compress_size = len(data)
+    zinfo.file_size = len(blob)
+    _append(target, zinfo, [data])
+
+
+def _raw_chunks(source, info):
+    """逐块读取 source 中一个成员的压缩数据（不解压）"""
+    source.fp.seek(info.header_offset)
+    header = source.fp.read(zipfile.sizeFileHeader)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    source.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_length + extra_length)
+    remaining = info.compress_size
+    while remaining:
+        chunk = source.fp.read(min(remaining, _COPY_CHUNK))
+        if not chunk:
+            raise zipfile.BadZipFile(f"{info.filename} 数据不完整")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _copy_raw(source, info, target):
+    """把 source 中的一个成员连同已压缩的数据原样写入 target，不解压也不重新压缩"""
+    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.flag_bits = info.flag_bits
+    zinfo.external_attr = info.external_attr
+    zinfo.create_system = info.create_system
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    zinfo.file_size = info.file_size
+    _append(target, zinfo, _raw_chunks(source, info))
+
+
+def save_presentation(prs, output_file, source_file=None, profile='default'):
+    """
+    保存PPT，未修改的部件直接复制原文件中的压缩数据
+
+    先写入临时文件再替换，output_file 可以与 source_file 相同。
+
+    Args:
+        prs: python-pptx 的 Presentation 对象
+        output_file: 输出PPTX文件路径
+        source_file: 打开 prs 时读取的PPTX文件，为None或不存在时所有部件都重新压缩
+        profile: 压缩方案，'draft'、'default' 或 'final'（见 PROFILES）
+
+    Returns:
+        dict: {'copied': 直接复制的成员数, 'compressed': 重新压缩的成员数}
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"未知的压缩方案 {profile!r}，可用: {', '.join(PROFILES)}")
+    level = PROFILES[profile]['level']
+    workers = PROFILES[profile]['workers']
+
+    stats = {'copied': 0, 'compressed': 0}
+    temp_file = output_file + '.saving'
+    source = zipfile.ZipFile(source_file) if source_file and os.path.exists(source_file) else None
+    executor = ThreadPoolExecutor(workers) if workers > 1 else None
+    try:
+        try:
+            source_infos = {info.filename: info for info in source.infolist()} if source else {}
+
+            # 先决定每个成员是复制还是压缩；并行时压缩任务立即提交，写入时按原顺序取结果
+            plan = []
+            for name, blob, is_xml in _members(prs):
+                info = source_infos.get(name)
+                if isinstance(blob, StreamedMediaPart):
+                    plan.append((name, None, blob, None))
+                elif info is not None and _reusable(info, level) and _unchanged(source, info, blob, is_xml):
+                    plan.append((name, info, None, None))
+                elif executor:
+                    plan.append((name, None, blob, _submit(executor, blob, level)))
+                else:
+                    plan.append((name, None, blob, None))
+
+            with zipfile.ZipFile(temp_file, 'w', strict_timestamps=False) as target:
+                for name, info, blob, futures in plan:
+                    if info is not None:
+                        _copy_raw(source, info, target)
+                        stats['copied'] += 1
+                    elif isinstance(blob, StreamedMediaPart):
+                        _write_stream(target, name, blob, level, executor)
+                        stats['compressed'] += 1
+                    else:
+                        data = b''.join(f.result() for f in futures) if futures else _compress(blob, level)
+                        _write_compressed(target, name, blob, data, level)
+                        stats['compressed'] += 1
+        finally:
+            # 替换文件前关闭原文件（output_file 可能就是 source_file，Windows 上不能替换打开着的文件）
+            if executor:
+                executor.shutdown(cancel_futures=True)
+            if source:
+                source.close()
+        os.replace(temp_file, output_file)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    return stats
@@ -0,0 +1,160 @@
+from collections import defaultdict
+from text_replace import replace_in_paragraph, _run_groups
+
+# 整个PPT的文字位置索引：打开PPT后只遍历一次 页/形状/段落/run，
+# 之后的查找和替换只访问包含目标文字的段落
+
+# 段落中被换行（a:br）、字段（a:fld）隔开的各组run之间的分隔符。
+# 替换不能跨过它们，查找也不能；XML中不会出现这个字符，所以不会被任何文字匹配
+_BREAK = '\x00'
+
+
+def _grams(text):
+    """文字中所有连续3个字符的片段（中文、日期、占位符都适用）"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _Entry:
+    """索引中的一个段落"""
+    __slots__ = ('slide_part', 'shape_index', 'paragraph_index', 'paragraph', 'text', 'grams')
+
+    def __init__(self, slide_part, shape_index, paragraph_index, paragraph):
+        self.slide_part = slide_part
+        self.shape_index = shape_index
+        self.paragraph_index = paragraph_index
+        self.paragraph = paragraph
+        self.text = ''
+        self.grams = set()
+
+
+class TextIndex:
+    """
+    文字 -> (页, 形状, 段落, run) 位置的索引
+
+    以3字符片段建立倒排表，查找时先用片段求出候选段落，再确认是否真的包含目标文字。
+    通过 replace 修改的段落会自动重新索引；新增、删除的幻灯片在下次查找时自动同步。
+    用其他方式修改了某页文字后，调用 invalidate(slide) 让该页在下次查找时重新索引。
+
+    Example:
+        index = TextIndex(prs)
+        index.find('18/01/2026')    # [(页码, 形状索引, 段落索引, run索引), ...]
+        index.replace(Replacer({'18/01/2026': '25/01/2026'}))
+    """
+
+    def __init__(self, prs):
+        self.prs = prs
+        self._slides = {}                    # slide_part -> [_Entry]
+        self._postings = defaultdict(set)    # 3字符片段 -> {_Entry}
+        self._dirty = set()                  # 需要重新索引的 slide_part
+        self._numbers = {}                   # slide_part -> 页码（从1开始）
+
+    def invalidate(self, slide):
+        """标记某页需要重新索引（slide 为幻灯片对象）"""
+        self._dirty.add(slide.part)
+
+    def _sync(self):
+        """与当前幻灯片列表同步：移除已删除的页，索引新页和被标记的页"""
+        part = self.prs.part
+        parts = [part.related_part(sldId.rId) for sldId in self.prs.slides._sldIdLst]
+        self._numbers = {slide_part: number for number, slide_part in enumerate(parts, 1)}
+        for slide_part in list(self._slides):
+            if slide_part not in self._numbers or slide_part in self._dirty:
+                self._drop_slide(slide_part)
+        for slide_part in parts:
+            if slide_part not in self._slides:
+                self._index_slide(slide_part)
+        self._dirty.clear()
+
+    def _index_slide(self, slide_part):
+        entries = []
+        for shape_index, shape in enumerate(slide_part.slide.shapes):
+            if shape.has_text_frame:
+                for paragraph_index, paragraph in enumerate(shape.text_frame.paragraphs):
+                    entry = _Entry(slide_part, shape_index, paragraph_index, paragraph)
+                    self._index_entry(entry)
+                    entries.append(entry)
+        self._slides[slide_part] = entries
+
+    def _drop_slide(self, slide_part):
+        for entry in self._slides.pop(slide_part):
+            self._unindex_entry(entry)
+
+    def _index_entry(self, entry):
+        entry.text = _BREAK.join(''.join(run.text for run in runs) for runs in _run_groups(entry.paragraph))
+        entry.grams = _grams(entry.text)
+        for gram in entry.grams:
+            self._postings[gram].add(entry)
+
+    def _unindex_entry(self, entry):
+        for gram in entry.grams:
+            postings = self._postings[gram]
+            postings.discard(entry)
+            if not postings:
+                del self._postings[gram]
+
+    def _candidates(self, text, slide_parts=None):
+        """可能包含 text 的段落"""
+        grams = _grams(text)
+        if grams:
+            postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+            entries = postings[0]
+        else:
+            # 少于3个字符的文字无法用片段过滤，直接检查已索引的段落文字（不需要重新遍历PPT）
+            entries = (entry for entries in self._slides.values() for entry in entries)
+        return [entry for entry in entries
+                if text in entry.text and (slide_parts is None or entry.slide_part in slide_parts)]
+
+    def _order(self, entry):
+        return self._numbers[entry.slide_part], entry.shape_index, entry.paragraph_index
+
+    def find(self, text):
+        """
+        查找文字出现的位置（包括被拆分到多个run中的文字）
+
+        Returns:
+            list: [(页码, 形状索引, 段落索引, run索引), ...]，run索引为匹配开始处的run
+        """
+        self._sync()
+        positions = []
+        for entry in sorted(self._candidates(text), key=self._order):
+            # ends[i]：第i个run在 entry.text 中的结束位置（各组之间有一个分隔符）
+            ends = []
+            position = 0
+            for runs in _run_groups(entry.paragraph):
+                for run in runs:
+                    position += len(run.text)
+                    ends.append(position)
+                position += len(_BREAK)
+            start = entry.text.find(text)
+            while start != -1:
+                run_index = next(i for i, end in enumerate(ends) if end > start)
+                positions.append(self._order(entry) + (run_index,))
+                start = entry.text.find(text, start + 1)
+        return positions
+
+    def replace(self, replacer, slides=None):
+        """
+        只在包含旧文字的段落中替换，并重新索引被修改的段落
+
+        Args:
+            replacer: text_replace.Replacer 对象
+            slides: 只在这些幻灯片中替换，为None时替换所有页
+
+        Returns:
+            list: 每处被修改的 (页码, 原文字, 新文字)
+        """
+        self._sync()
+        slide_parts = None if slides is None else {slide.part for slide in slides}
+        entries = set()
+        for old_text in replacer.replacements:
+            entries.update(self._candidates(old_text, slide_parts))
+
+        changes = []
+        for entry in sorted(entries, key=self._order):
+            paragraph_changes = replace_in_paragraph(entry.paragraph, replacer)
+            if paragraph_changes:
+                self._unindex_entry(entry)
+                self._index_entry(entry)
+                number = self._numbers[entry.slide_part]
+                changes.extend((number, old, new) for old, new in paragraph_changes)
+        return changes
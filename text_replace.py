@@ -0,0 +1,123 @@
+import re
+
+# 多模式文字替换：把 {'旧文字': '新文字'} 编译为一个正则，每段文字只扫描一次
+
+
+class Replacer:
+    """
+    编译好的多模式替换器
+
+    所有旧文字在一次扫描中匹配，同一位置有多个候选时取最长的（最左最长匹配）。
+    替换结果不会再次被匹配，因此结果与字典顺序无关。
+    编译一次后可在多页、多个PPT之间重复使用。
+
+    Example:
+        replacer = Replacer({'18/01/2026': '25/01/2026', '于福芬': '吴兴隆'})
+        replacer.replace('日期 18/01/2026')    # '日期 25/01/2026'
+    """
+
+    def __init__(self, replacements):
+        """
+        Args:
+            replacements: 字典，格式 {'旧文字': '新文字'}，空字符串的旧文字被忽略
+        """
+        self.replacements = {old: new for old, new in replacements.items() if old}
+        # 按长度从长到短排列：正则在同一位置按顺序尝试，先命中的就是最长的
+        patterns = sorted(self.replacements, key=len, reverse=True)
+        self._regex = re.compile('|'.join(map(re.escape, patterns))) if patterns else None
+
+    @classmethod
+    def of(cls, replacements):
+        """字典编译为 Replacer，已经是 Replacer 时直接返回"""
+        return replacements if isinstance(replacements, cls) else cls(replacements)
+
+    def __bool__(self):
+        return self._regex is not None
+
+    def finditer(self, text):
+        """返回 text 中所有匹配（re.Match）"""
+        if self._regex is None:
+            return iter(())
+        return self._regex.finditer(text)
+
+    def replace(self, text):
+        """
+        Returns:
+            str: 替换后的文字（没有匹配时返回原字符串）
+        """
+        if self._regex is None:
+            return text
+        return self._regex.sub(lambda match: self.replacements[match.group()], text)
+
+
+def _run_groups(paragraph):
+    """把段落中相邻的run分组；换行（a:br）和字段（a:fld）把文字隔开，匹配不能跨过它们"""
+    groups = []
+    previous = None
+    for run in paragraph.runs:
+        if previous is None or run._r.getprevious() is not previous:
+            groups.append([])
+        groups[-1].append(run)
+        previous = run._r
+    return groups
+
+
+def replace_in_paragraph(paragraph, replacer):
+    """
+    在一个段落中替换文字，可以匹配被PowerPoint拆分到多个run中的文字（如 "18/0" + "1/2026"）
+
+    先把相邻run的文字拼接起来，记录每个run在拼接文字中的起止位置，
+    在拼接文字上一次性匹配，再把结果写回各run：替换文字写入匹配开始处的run（保留它的格式），
+    匹配覆盖的其余部分从后续run中删除。每个段落的处理时间与文字长度成线性关系。
+
+    Args:
+        paragraph: python-pptx 段落对象
+        replacer: Replacer 对象
+
+    Returns:
+        list: 每处被修改的 (原文字, 新文字)，按run组记录
+    """
+    changes = []
+    for runs in _run_groups(paragraph):
+        texts = [run.text for run in runs]
+        joined = ''.join(texts)
+        matches = list(replacer.finditer(joined))
+        if not matches:
+            continue
+
+        # ends[i]：第i个run在拼接文字中的结束位置
+        ends = []
+        position = 0
+        for text in texts:
+            position += len(text)
+            ends.append(position)
+
+        pieces = [[] for _ in runs]
+        index = 0      # 当前run
+        position = 0   # 已写回的位置
+
+        def emit(end):
+            # 把 [position, end) 的原文字按run边界写回
+            nonlocal index, position
+            while position < end:
+                while ends[index] <= position:
+                    index += 1
+                stop = min(end, ends[index])
+                start_of_run = ends[index] - len(texts[index])
+                pieces[index].append(texts[index][position - start_of_run:stop - start_of_run])
+                position = stop
+
+        for match in matches:
+            emit(match.start())
+            while ends[index] <= match.start():
+                index += 1
+            pieces[index].append(replacer.replacements[match.group()])
+            position = match.end()
+        emit(len(joined))
+
+        for run, text, piece in zip(runs, texts, pieces):
+            new_text = ''.join(piece)
+            if new_text != text:
+                run.text = new_text
+        changes.append((joined, ''.join(''.join(piece) for piece in pieces)))
+    return changes
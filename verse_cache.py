@@ -0,0 +1,171 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# 经文磁盘缓存：按 (译本, 卷, 章, 起始节, 结束节) 缓存 bible-api 的返回结果
+# 使用 SQLite（WAL 模式）保存，中文和法语两个生成脚本可以同时读写同一个缓存文件
+# ChapterCache 是进程内按章的区间缓存，同一章的后续子范围无需再请求
+
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'verse_cache.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    translation TEXT NOT NULL,
+    book TEXT NOT NULL,
+    chapter INTEGER NOT NULL,
+    start_verse INTEGER NOT NULL,
+    end_verse INTEGER NOT NULL,
+    verses TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (translation, book, chapter, start_verse, end_verse)
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+class VerseCache:
+    """
+    有容量上限（LRU淘汰）和可选过期时间的经文磁盘缓存
+
+    Example:
+        cache = VerseCache(max_entries=500, ttl=7 * 24 * 3600)
+        verses = cache.get('cuv', '路加福音', 9, 1, 6)
+        if verses is None:
+            verses = ...  # 联网获取
+            cache.put('cuv', '路加福音', 9, 1, 6, verses)
+    """
+
+    def __init__(self, cache_file=DEFAULT_CACHE, max_entries=2000, ttl=None, touch_interval=3600):
+        """
+        Args:
+            cache_file: 缓存文件路径
+            max_entries: 最多缓存的条目数，超出时淘汰最久未使用的条目
+            ttl: 条目有效期（秒），为None时永不过期
+            touch_interval: 命中时只有上次使用时间早于这么多秒才更新（LRU只需要粗略的使用时间），
+                            大多数读取不写数据库，不与另一个进程的写入争用锁
+        """
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+
+    def _connect(self):
+        """每个线程一个连接；多个进程同时写入时最多等待30秒"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.cache_file, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, translation, book_name, chapter, start_verse, end_verse):
+        """
+        读取缓存
+
+        Returns:
+            list: [(节号, 经文原文), ...]；未缓存或已过期时返回None
+        """
+        conn = self._connect()
+        key = (translation, book_name, chapter, start_verse, end_verse)
+        row = conn.execute(
+            "SELECT verses, created, last_used FROM entries WHERE translation = ? AND book = ? AND chapter = ? "
+            "AND start_verse = ? AND end_verse = ?", key).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if self.ttl is not None and now - row[1] > self.ttl:
+            conn.execute(
+                "DELETE FROM entries WHERE translation = ? AND book = ? AND chapter = ? "
+                "AND start_verse = ? AND end_verse = ?", key)
+            return None
+
+        if now - row[2] > self.touch_interval:
+            conn.execute(
+                "UPDATE entries SET last_used = ? WHERE translation = ? AND book = ? AND chapter = ? "
+                "AND start_verse = ? AND end_verse = ?", (now,) + key)
+        return [tuple(verse) for verse in json.loads(row[0])]
+
+    def put(self, translation, book_name, chapter, start_verse, end_verse, verses):
+        """
+        写入缓存，并在超出容量时淘汰最久未使用的条目
+
+        Args:
+            verses: [(节号, 经文原文), ...]
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(translation, book, chapter, start_verse, end_verse, verses, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (translation, book_name, chapter, start_verse, end_verse,
+                 json.dumps(verses, ensure_ascii=False), now, now))
+            count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM entries WHERE rowid IN "
+                    "(SELECT rowid FROM entries ORDER BY last_used LIMIT ?)", (count - self.max_entries,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        """清空缓存"""
+        self._connect().execute("DELETE FROM entries")
+
+
+class ChapterCache:
+    """
+    按章保存已获取经文的内存缓存，记录每章已有的节区间
+
+    例如已获取路加福音 9:1-17 后，9:7-11、9:12-17 等任意子范围都直接从内存返回。
+    """
+
+    def __init__(self):
+        # (译本, 卷, 章) -> (已有区间列表 [[起始节, 结束节], ...]（有序、不重叠）, {节号: 经文})
+        self._chapters = {}
+        self._lock = threading.Lock()
+
+    def add(self, translation, book_name, chapter, start_verse, end_verse, verses):
+        """
+        记录一段已获取的经文
+
+        Args:
+            start_verse: 请求的起始节
+            end_verse: 请求的结束节
+            verses: 字典 {节号: 经文}（API跳过的节不会出现在其中）
+        """
+        with self._lock:
+            intervals, texts = self._chapters.setdefault((translation, book_name, chapter), ([], {}))
+            texts.update(verses)
+            # 插入新区间，并与重叠或相邻的区间合并
+            merged = []
+            for interval in sorted(intervals + [[start_verse, end_verse]]):
+                if merged and interval[0] <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], interval[1])
+                else:
+                    merged.append(list(interval))
+            intervals[:] = merged
+
+    def get(self, translation, book_name, chapter, start_verse, end_verse):
+        """
+        Returns:
+            list: 该范围内的 [(节号, 经文), ...]；范围未被完全覆盖时返回None
+        """
+        with self._lock:
+            entry = self._chapters.get((translation, book_name, chapter))
+            if entry is None:
+                return None
+            intervals, texts = entry
+            if not any(start <= start_verse and end_verse <= end for start, end in intervals):
+                return None
+            return [(verse, texts[verse]) for verse in range(start_verse, end_verse + 1) if verse in texts]